@@ -0,0 +1,98 @@
+"""Mide el arranque en frío de la app: imports por sección y primer render.
+
+Uso: python benchmarks/bench_arranque.py [--repeticiones 5] [--presupuesto-ms 1500]
+
+Cada medición corre en un intérprete nuevo (como tras un spin-down de Render):
+- el import de `app` sin sección (streamlit + el registro de secciones),
+- el import de cada sección, que la app solo hace al abrirla,
+- el import monolítico que hacía app.py antes de separarse en secciones,
+- el primer render de app.py (sección inicial) con streamlit.testing.AppTest.
+
+Termina con código 1 si el primer render en frío supera el presupuesto.
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+import numpy as np
+
+RAIZ = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, RAIZ)
+
+import secciones  # noqa: E402
+
+
+# Imports de nivel superior del app.py monolítico
+MONOLITICO = [
+    "streamlit.components.v1", "pandas", "plotly.express", "plotly.graph_objects", "folium",
+    "streamlit_folium", "PIL.Image", "numpy", "correlacion", "cubo", "datos", "exportar",
+    "filtros", "mapa", "regresion", "submuestreo",
+]
+
+MEDIR_IMPORT = """
+import sys, time
+import streamlit
+inicio = time.perf_counter()
+for modulo in sys.argv[1:]:
+    __import__(modulo)
+print(time.perf_counter() - inicio)
+"""
+
+MEDIR_RENDER = """
+import time
+inicio = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_file("app.py", default_timeout=120).run()
+assert not at.exception, at.exception
+print(time.perf_counter() - inicio)
+"""
+
+
+def medir(codigo, argumentos, repeticiones):
+    tiempos = []
+    for _ in range(repeticiones):
+        salida = subprocess.run(
+            [sys.executable, "-c", codigo, *argumentos], cwd=RAIZ, capture_output=True, text=True
+        )
+        if salida.returncode != 0:
+            return None, salida.stderr.strip().splitlines()[-1]
+        tiempos.append(float(salida.stdout.strip().splitlines()[-1]))
+    return float(np.median(tiempos)), None
+
+
+def fila(nombre, segundos, error=None):
+    if error:
+        print(f"{nombre:<34} {'—':>10}  {error}")
+    else:
+        print(f"{nombre:<34} {segundos * 1e3:>10.0f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeticiones", type=int, default=5)
+    parser.add_argument("--presupuesto-ms", type=float, default=1500)
+    args = parser.parse_args()
+
+    print(f"{'import (tras streamlit)':<34} {'ms':>10}")
+    fila("app (sin sección)", *medir(MEDIR_IMPORT, ["secciones"], args.repeticiones))
+
+    for opcion, modulo in secciones.SECCIONES.items():
+        fila(opcion, *medir(MEDIR_IMPORT, ["secciones", f"secciones.{modulo}"], args.repeticiones))
+
+    todas = ["secciones"] + [f"secciones.{modulo}" for modulo in secciones.SECCIONES.values()]
+    fila("todas las secciones", *medir(MEDIR_IMPORT, todas, args.repeticiones))
+    fila("app.py monolítico (antes)", *medir(MEDIR_IMPORT, MONOLITICO, args.repeticiones))
+
+    print()
+    render, error = medir(MEDIR_RENDER, [], args.repeticiones)
+    fila("primer render (AppTest, en frío)", render, error)
+
+    if render is None or render * 1e3 > args.presupuesto_ms:
+        print(f"\n❌ El primer render supera el presupuesto de {args.presupuesto_ms:.0f} ms")
+        sys.exit(1)
+    print(f"\n✔ Primer render dentro del presupuesto de {args.presupuesto_ms:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""Compara el motor FFT de wavelet.py con pywt.cwt (convolución directa).
+
+Uso: python benchmarks/bench_cwt.py [--repeticiones 5]
+
+Para cada wavelet, largo de serie y número de escalas mide la mediana del
+tiempo de ambos motores y el error relativo máximo entre sus coeficientes.
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pywt
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import wavelet  # noqa: E402
+
+
+LARGOS = [372, 3_650, 11_000]  # mensual 31 años, diario 10 años, diario 30 años
+ESCALAS = [32, 128, 256]
+
+
+def medir(funcion, repeticiones):
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        resultado = funcion()
+        tiempos.append(time.perf_counter() - inicio)
+    return float(np.median(tiempos)), resultado
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeticiones", type=int, default=5)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    print(f"{'wavelet':<7} {'N':>7} {'escalas':>7} {'conv (ms)':>10} {'fft (ms)':>9} {'x':>6} {'error rel.':>10}")
+    for nombre_wavelet in wavelet.WAVELETS:
+        for n in LARGOS:
+            senal = rng.normal(size=n).cumsum()
+            for num_escala in ESCALAS:
+                escalas = np.arange(1, num_escala)
+                t_conv, ref = medir(lambda: pywt.cwt(senal, escalas, wavelet=nombre_wavelet)[0], args.repeticiones)
+                # La primera llamada construye los kernels; se mide ya en caliente
+                wavelet.cwt_fft(senal, escalas, nombre_wavelet)
+                t_fft, coef = medir(lambda: wavelet.cwt_fft(senal, escalas, nombre_wavelet), args.repeticiones)
+                error = np.abs(coef - ref).max() / np.abs(ref).max()
+                print(
+                    f"{nombre_wavelet:<7} {n:>7} {num_escala:>7} {t_conv * 1e3:>10.1f} "
+                    f"{t_fft * 1e3:>9.1f} {t_conv / t_fft:>6.1f} {error:>10.1e}"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,250 @@
+"""Benchmark de todas las secciones de la app con streamlit.testing.AppTest.
+
+Uso: python benchmarks/bench_secciones.py [--repeticiones 5] [--escala 1|10|100]
+                                          [--datos data_sintetico]
+                                          [--escenarios wavelet,mapa] [--json resultados.json]
+
+Cada escenario abre una sección en un proceso nuevo, fija un estado de widgets
+representativo (todas las estaciones en Comparar, 256 escalas en Wavelet, el
+heatmap animado completo, todos los años del mapa...) y mide:
+
+- primera: la primera ejecución con ese estado (cachés frías),
+- p50/p95/máx: las re-ejecuciones siguientes (cachés calientes; en el mapa,
+  una por año),
+- pico de memoria de Python durante una ejecución extra (tracemalloc),
+- KB enviados: figuras serializadas por ejecución (etapa "render" de metricas).
+
+Con --escala K se generan con sintetico.py tantas estaciones como K veces las
+reales (6 × K) en una carpeta temporal que la app lee vía ENSO_DATOS. Con
+--datos se usa una carpeta ya generada.
+"""
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+RAIZ = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+sys.path.insert(0, RAIZ)
+
+
+# --- Escenarios ---
+def widget(lista, etiqueta):
+    return next(w for w in lista if w.label.startswith(etiqueta))
+
+
+def elegir(tipo, etiqueta, valor):
+    return lambda at: widget(getattr(at, tipo), etiqueta).set_value(valor)
+
+
+def varios(*acciones):
+    # Cada acción salvo la última necesita una ejecución para que aparezca la siguiente
+    def aplicar(at):
+        for accion in acciones[:-1]:
+            accion(at)
+            at.run()
+        acciones[-1](at)
+    return aplicar
+
+
+def todas_las_estaciones(at):
+    selector = widget(at.multiselect, "🎯 Escoge las estaciones")
+    selector.set_value(selector.options)
+
+
+def cada_año(at):
+    for año in range(1992, 2023):
+        yield lambda at, año=año: at.slider(key="año_mapa").set_value(año)
+
+
+ANALISIS = "🔍 Elige qué análisis"
+COMPARACION = "📌 Elige el tipo de comparación"
+MODO_CORR = "🔍 ¿Qué deseas hacer?"
+
+# nombre -> (opción del menú, estado representativo, pasos medidos o None = re-ejecutar)
+ESCENARIOS = {
+    "introduccion": ("📘 Introducción", None, None),
+    "analisis_boxplots": ("📈 Análisis Gráfico", elegir("selectbox", ANALISIS, "📦 Boxplots"), None),
+    "analisis_series": ("📈 Análisis Gráfico", elegir("selectbox", ANALISIS, "📉 Series Temporales"), None),
+    "analisis_dispersion": (
+        "📈 Análisis Gráfico", elegir("selectbox", ANALISIS, "📎 Dispersión SPI vs Precipitación"), None
+    ),
+    "analisis_panel": ("📈 Análisis Gráfico", elegir("selectbox", ANALISIS, "🧭 Panel Climático"), None),
+    "analisis_personalizado": (
+        "📈 Análisis Gráfico", elegir("selectbox", ANALISIS, "🛠️ Visualizador Personalizado"), None
+    ),
+    **{
+        f"comparar_{clave}": (
+            "📊 Comparar Estaciones",
+            varios(todas_las_estaciones, elegir("selectbox", COMPARACION, opcion)),
+            None,
+        )
+        for clave, opcion in [
+            ("tabla", "📈 Tabla resumen de métricas"),
+            ("boxplots", "📦 Boxplots SPI y Precipitación"),
+            ("spi", "📉 Serie temporal SPI promedio"),
+            ("anual", "🌧️ Precipitación anual acumulada"),
+            ("panel", "🧭 Panel comparativo por estación"),
+            ("heatmap", "🔥 Mapa de calor de métricas por estación"),
+        ]
+    },
+    "ndvi": ("🌿 NDVI - Análisis Anual", None, None),
+    "correlaciones_estacion": ("📊 Correlaciones", None, None),
+    "correlaciones_comparar": ("📊 Correlaciones", elegir("radio", MODO_CORR, "🔸 Comparar dos estaciones"), None),
+    "correlaciones_animado": ("📊 Correlaciones", elegir("radio", MODO_CORR, "📽️ Heatmap Animado por Año"), None),
+    "correlaciones_animado_ventana10": (
+        "📊 Correlaciones",
+        varios(
+            elegir("radio", MODO_CORR, "📽️ Heatmap Animado por Año"),
+            lambda at: at.slider(key="ventana_corr").set_value(10),
+        ),
+        None,
+    ),
+    "wavelet_256": ("🌊 Wavelet", elegir("slider", "🔍 Número de escalas", 256), None),
+    "wavelet_256_significancia": (
+        "🌊 Wavelet",
+        varios(
+            elegir("slider", "🔍 Número de escalas", 256),
+            elegir("checkbox", "🔬 Contornos de significancia", True),
+        ),
+        None,
+    ),
+    "mapa_todos_los_años": ("🗺️ Mapa Interactivo", None, cada_año),
+}
+
+
+# --- Proceso hijo: un escenario ---
+def payload_kb(ruta, desde):
+    with open(ruta, encoding="utf-8") as f:
+        f.seek(desde)
+        lineas = [json.loads(linea) for linea in f]
+    return sum(m["bytes"] or 0 for m in lineas if m["etapa"] == "render") / 1024
+
+
+def ejecutar(at):
+    inicio = time.perf_counter()
+    at.run()
+    segundos = time.perf_counter() - inicio
+    if at.exception:
+        raise RuntimeError(at.exception[0].value)
+    return segundos
+
+
+def correr_escenario(nombre, repeticiones):
+    from streamlit.testing.v1 import AppTest
+
+    opcion, preparar, pasos = ESCENARIOS[nombre]
+    registro = os.environ["ENSO_METRICAS_JSONL"]
+
+    at = AppTest.from_file(os.path.join(RAIZ, "app.py"), default_timeout=600)
+    at.run()
+    at.sidebar.radio[0].set_value(opcion)
+    at.run()
+    if preparar:
+        preparar(at)
+
+    # Primera ejecución con el estado representativo (cachés del estado frías)
+    desde = os.path.getsize(registro)
+    primera = ejecutar(at)
+    payload = [payload_kb(registro, desde)]
+
+    tiempos = []
+    acciones = list(pasos(at)) if pasos else [None] * repeticiones
+    for accion in acciones:
+        if accion:
+            accion(at)
+        desde = os.path.getsize(registro)
+        tiempos.append(ejecutar(at))
+        payload.append(payload_kb(registro, desde))
+
+    tracemalloc.start()
+    ejecutar(at)
+    pico = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return {
+        "escenario": nombre,
+        "primera_ms": primera * 1e3,
+        "p50_ms": float(np.percentile(tiempos, 50) * 1e3),
+        "p95_ms": float(np.percentile(tiempos, 95) * 1e3),
+        "max_ms": float(np.max(tiempos) * 1e3),
+        "ejecuciones": len(tiempos),
+        "pico_mb": pico / 2**20,
+        "payload_kb": float(np.median(payload)),
+    }
+
+
+# --- Proceso principal ---
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeticiones", type=int, default=5)
+    parser.add_argument("--escala", type=int, default=1)
+    parser.add_argument("--datos", help="carpeta de estaciones con su snapshot (p. ej. de sintetico.py)")
+    parser.add_argument("--escenarios", help="nombres o prefijos separados por coma")
+    parser.add_argument("--json", help="guarda los resultados en este archivo")
+    parser.add_argument("--hijo", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.hijo:
+        print(json.dumps(correr_escenario(args.hijo, args.repeticiones)))
+        return
+
+    os.chdir(RAIZ)
+    nombres = list(ESCENARIOS)
+    if args.escenarios:
+        prefijos = args.escenarios.split(",")
+        nombres = [n for n in nombres if any(n.startswith(p) for p in prefijos)]
+
+    temporal = tempfile.mkdtemp(prefix="bench_enso_")
+    entorno = {**os.environ, "ENSO_METRICAS_JSONL": os.path.join(temporal, "metricas.jsonl")}
+    entorno.pop("ENSO_METRICAS_PROM", None)
+    if args.datos:
+        entorno["ENSO_DATOS"] = os.path.abspath(args.datos)
+    elif args.escala > 1:
+        import datos
+        import sintetico
+
+        datos_dir = os.path.join(temporal, "datos")
+        total = len(datos.estaciones_en_disco()) * args.escala
+        inicio = time.perf_counter()
+        sintetico.generar(datos_dir, total)
+        sintetico.compilar(datos_dir, silencioso=True)
+        print(f"Datos ×{args.escala}: {total} estaciones ({time.perf_counter() - inicio:.1f} s)\n")
+        entorno["ENSO_DATOS"] = datos_dir
+
+    print(
+        f"{'escenario':<34} {'primera':>9} {'p50':>8} {'p95':>8} {'máx':>8} {'n':>4} {'pico MB':>8} {'KB':>8}"
+    )
+    resultados = []
+    try:
+        for nombre in nombres:
+            open(entorno["ENSO_METRICAS_JSONL"], "w").close()
+            salida = subprocess.run(
+                [sys.executable, __file__, "--hijo", nombre, "--repeticiones", str(args.repeticiones)],
+                cwd=RAIZ, env=entorno, capture_output=True, text=True,
+            )
+            if salida.returncode != 0:
+                print(f"{nombre:<34} ❌ {salida.stderr.strip().splitlines()[-1]}")
+                continue
+            r = json.loads(salida.stdout.strip().splitlines()[-1])
+            resultados.append(r)
+            print(
+                f"{nombre:<34} {r['primera_ms']:>9.0f} {r['p50_ms']:>8.0f} {r['p95_ms']:>8.0f} "
+                f"{r['max_ms']:>8.0f} {r['ejecuciones']:>4} {r['pico_mb']:>8.1f} {r['payload_kb']:>8.0f}"
+            )
+    finally:
+        shutil.rmtree(temporal, ignore_errors=True)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"escala": args.escala, "repeticiones": args.repeticiones, "resultados": resultados}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+"""Motor de correlaciones por año a partir de estadísticos suficientes.
+
+Para cada año se guardan n, la suma de cada variable y la matriz de productos
+cruzados. Cualquier combinación de años (un año, una ventana móvil o un rango)
+se obtiene sumando esos estadísticos, sin volver a recorrer las filas.
+"""
+import numpy as np
+import pandas as pd
+
+
+# --- Estadísticos suficientes ---
+def estadisticos_anuales(df, variables, columna_año="Año"):
+    variables = list(variables)
+    completos = df.dropna(subset=[columna_año, *variables])
+    x = completos[variables].to_numpy(dtype=float)
+    # Centrar con la media global evita perder precisión en las sumas de cuadrados
+    centro = x.mean(axis=0) if len(x) else np.zeros(len(variables))
+    x = x - centro
+
+    años, grupo = np.unique(completos[columna_año].to_numpy().astype(int), return_inverse=True)
+    orden = np.argsort(grupo, kind="stable")
+    x = x[orden]
+    n = np.bincount(grupo, minlength=len(años))
+    inicios = np.r_[0, np.cumsum(n)[:-1]]
+
+    # Una sola pasada agrupada: reduceat suma los tramos contiguos de cada año
+    if len(x):
+        suma = np.add.reduceat(x, inicios, axis=0)
+        productos = np.add.reduceat(x[:, :, None] * x[:, None, :], inicios, axis=0)
+    else:
+        suma = np.zeros((0, len(variables)))
+        productos = np.zeros((0, len(variables), len(variables)))
+    return {
+        "variables": variables,
+        "años": años,
+        "n": n.astype(float),
+        "suma": suma,
+        "productos": productos,
+    }
+
+
+def _subconjunto(est, variables):
+    if variables is None:
+        return est["variables"], est["suma"], est["productos"]
+    idx = [est["variables"].index(v) for v in variables]
+    return list(variables), est["suma"][..., idx], est["productos"][..., idx, :][..., idx]
+
+
+# --- Correlación desde los estadísticos ---
+def _correlaciones(n, suma, productos):
+    # Acepta un eje inicial de grupos: n (G,), suma (G, k), productos (G, k, k)
+    n = np.asarray(n, dtype=float)[..., None, None]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        media = suma[..., :, None] / n
+        cov = productos / n - media * np.swapaxes(media, -1, -2)
+        desv = np.sqrt(np.clip(np.diagonal(cov, axis1=-2, axis2=-1), 0, None))
+        r = cov / (desv[..., :, None] * desv[..., None, :])
+    # Con menos de dos filas o varianza nula la correlación no está definida
+    r[np.broadcast_to(n < 2, r.shape) | ~np.isfinite(r)] = np.nan
+    return np.clip(r, -1, 1)
+
+
+def _tabla(r, variables):
+    return pd.DataFrame(r, index=variables, columns=variables)
+
+
+def por_año(est, variables=None):
+    variables, suma, productos = _subconjunto(est, variables)
+    r = _correlaciones(est["n"], suma, productos)
+    return {int(año): _tabla(r[i], variables) for i, año in enumerate(est["años"])}
+
+
+def rango(est, desde, hasta, variables=None):
+    # Correlación del periodo [desde, hasta] combinando los años que contiene
+    variables, suma, productos = _subconjunto(est, variables)
+    sel = (est["años"] >= desde) & (est["años"] <= hasta)
+    r = _correlaciones(est["n"][sel].sum(), suma[sel].sum(axis=0), productos[sel].sum(axis=0))
+    return _tabla(r, variables)
+
+
+def ventana_movil(est, ancho, variables=None):
+    # Ventanas de `ancho` años calendario que terminan en cada año disponible
+    variables, suma, productos = _subconjunto(est, variables)
+    años = est["años"]
+    acumular = lambda a: np.concatenate([np.zeros((1,) + a.shape[1:]), np.cumsum(a, axis=0)])
+    n_acum, suma_acum, prod_acum = acumular(est["n"]), acumular(suma), acumular(productos)
+    fin = np.arange(1, len(años) + 1)
+    inicio = np.searchsorted(años, años - ancho + 1)
+    r = _correlaciones(
+        n_acum[fin] - n_acum[inicio],
+        suma_acum[fin] - suma_acum[inicio],
+        prod_acum[fin] - prod_acum[inicio],
+    )
+    return {int(año): _tabla(r[i], variables) for i, año in enumerate(años)}
+
+
+# --- Animación en el navegador ---
+def figura_animada(matrices, titulo):
+    # Un frame por año; Plotly reproduce la animación en el cliente sin
+    # volver a pedir nada al servidor
+    import plotly.graph_objects as go
+
+    años = sorted(matrices)
+    variables = list(matrices[años[0]].columns)
+    celda = lambda año: dict(
+        z=matrices[año].to_numpy(), x=variables, y=variables,
+        text=matrices[año].round(2).to_numpy(), texttemplate="%{text}",
+    )
+    fig = go.Figure(
+        data=[go.Heatmap(**celda(años[0]), colorscale="RdBu_r", zmin=-1, zmax=1,
+                         colorbar=dict(title="Correlación"))],
+        frames=[
+            go.Frame(data=[go.Heatmap(**celda(año))], name=str(año),
+                     layout=dict(title_text=f"{titulo} ({año})"))
+            for año in años
+        ],
+    )
+    fig.update_layout(
+        template="plotly_white",
+        height=560,
+        title=f"{titulo} ({años[0]})",
+        yaxis=dict(autorange="reversed"),
+        sliders=[dict(
+            currentvalue=dict(prefix="📅 Año: "),
+            pad=dict(t=40),
+            steps=[
+                dict(label=str(año), method="animate",
+                     args=[[str(año)], dict(mode="immediate", frame=dict(duration=0, redraw=True))])
+                for año in años
+            ],
+        )],
+    )
+    return fig
+
+
+def controles_animacion(fig, inicio, segundos):
+    # Copia de la figura cacheada posicionada en `inicio`, con botones para
+    # reproducir hacia adelante o hacia atrás a `segundos` por frame
+    import plotly.graph_objects as go
+
+    fig = go.Figure(fig)
+    nombres = [frame.name for frame in fig.frames]
+    pos = nombres.index(str(inicio))
+    fig.update_traces(z=fig.frames[pos].data[0].z, text=fig.frames[pos].data[0].text)
+    fig.update_layout(title=fig.frames[pos].layout.title.text)
+    fig.layout.sliders[0].active = pos
+
+    reproducir = dict(
+        mode="immediate", frame=dict(duration=int(segundos * 1000), redraw=True), transition=dict(duration=0),
+    )
+    fig.update_layout(updatemenus=[dict(
+        type="buttons", direction="left", x=0, y=-0.08, xanchor="left", yanchor="top",
+        buttons=[
+            dict(label="↪️ Adelante", method="animate", args=[nombres[pos:], reproducir]),
+            dict(label="↩️ Atrás", method="animate", args=[nombres[:pos + 1][::-1], reproducir]),
+            dict(label="⏸️ Pausa", method="animate",
+                 args=[[None], dict(mode="immediate", frame=dict(duration=0, redraw=False))]),
+        ],
+    )])
+    return fig
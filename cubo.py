@@ -0,0 +1,144 @@
+"""Cubo de agregados Estación × Fase ENSO × Año × Mes, materializado en la ingesta.
+
+Cada celda guarda, por medida, n, suma, mínimo, máximo y un sketch de cuantiles
+fusionable. Los KPIs, las barras y las tablas resumen se responden combinando
+celdas del cubo en lugar de volver a agrupar las filas originales.
+"""
+import numpy as np
+import pandas as pd
+
+
+DIMENSIONES = ["Estación", "Fase_ENSO", "Año", "Mes"]
+MEDIDAS = ["Precipitación", "SPI"]
+CAPACIDAD_SKETCH = 512
+
+
+# --- Sketch de cuantiles (compactación tipo KLL) ---
+# Un sketch es un par (valores, pesos). Mientras tenga menos de
+# CAPACIDAD_SKETCH elementos es exacto; al superarla se compacta el nivel de
+# menor peso quedándose con uno de cada dos valores ordenados y duplicando su
+# peso. Fusionar es concatenar y volver a compactar.
+def compactar(valores, pesos, capacidad=CAPACIDAD_SKETCH):
+    valores = np.asarray(valores, dtype=float)
+    pesos = np.asarray(pesos, dtype=float)
+    while len(valores) > capacidad:
+        niveles, cuenta = np.unique(pesos, return_counts=True)
+        if not (cuenta >= 2).any():
+            break
+        nivel = niveles[np.argmax(cuenta >= 2)]
+        en_nivel = pesos == nivel
+        orden = np.sort(valores[en_nivel])
+        # Si el nivel es impar, el último valor queda sin compactar
+        pares = orden[: len(orden) // 2 * 2]
+        desplazamiento = len(pares) // 2 % 2  # determinista, alterna entre compactaciones
+        elegidos = pares[desplazamiento::2]
+        resto = orden[len(pares):]
+        valores = np.concatenate([valores[~en_nivel], elegidos, resto])
+        pesos = np.concatenate([
+            pesos[~en_nivel], np.full(len(elegidos), nivel * 2), np.full(len(resto), nivel)
+        ])
+    orden = np.argsort(valores, kind="stable")
+    return valores[orden], pesos[orden]
+
+
+def sketch(valores):
+    valores = np.asarray(valores, dtype=float)
+    valores = valores[~np.isnan(valores)]
+    return compactar(valores, np.ones(len(valores)))
+
+
+def fusionar(sketches):
+    sketches = list(sketches)
+    if not sketches:
+        return np.empty(0), np.empty(0)
+    return compactar(
+        np.concatenate([valores for valores, _ in sketches]),
+        np.concatenate([pesos for _, pesos in sketches]),
+    )
+
+
+def cuantil(sk, q):
+    # Con pesos unitarios coincide con la interpolación lineal de pandas/numpy
+    valores, pesos = sk
+    if len(valores) == 0:
+        return np.nan
+    fin = np.cumsum(pesos)
+    centro = fin - pesos + (pesos - 1) / 2
+    return float(np.interp(q * (fin[-1] - 1), centro, valores))
+
+
+# --- Construcción ---
+def construir_cubo(almacen):
+    df = almacen.reset_index() if "Estación" not in almacen.columns else almacen
+    grupos = df.groupby(DIMENSIONES, observed=True, sort=True)
+    columnas = {}
+    for medida in MEDIDAS:
+        columnas[f"{medida}_n"] = grupos[medida].count()
+        columnas[f"{medida}_suma"] = grupos[medida].sum()
+        columnas[f"{medida}_min"] = grupos[medida].min()
+        columnas[f"{medida}_max"] = grupos[medida].max()
+        sketches = grupos[medida].agg(lambda serie: sketch(serie.to_numpy()))
+        columnas[f"{medida}_valores"] = sketches.map(lambda sk: sk[0])
+        columnas[f"{medida}_pesos"] = sketches.map(lambda sk: sk[1])
+    return pd.DataFrame(columnas).reset_index()
+
+
+# --- Consultas ---
+_ADITIVOS = {"count": ("n", "sum"), "sum": ("suma", "sum"), "min": ("min", "min"), "max": ("max", "max")}
+
+
+def _cuantil_grupo(grupo, medida, q):
+    return cuantil(fusionar(zip(grupo[f"{medida}_valores"], grupo[f"{medida}_pesos"])), q)
+
+
+def resumir(celdas, por, estadisticos):
+    # estadisticos: {medida: ["count", "sum", "mean", "min", "max", "median" o un cuantil 0-1]}
+    # Devuelve una fila por grupo de `por` con columnas "<medida>_<estadístico>"
+    por = list(por)
+    if celdas.empty:
+        # Selección vacía: tabla sin filas pero con las columnas esperadas
+        nombres = [f"{medida}_{est}" for medida, lista in estadisticos.items() for est in lista]
+        return pd.DataFrame(columns=por + nombres)
+    clave = por or (lambda _: 0)
+    grupos = celdas.groupby(clave, observed=True, sort=True)
+    resultado = {}
+    for medida, lista in estadisticos.items():
+        for est in lista:
+            nombre = f"{medida}_{est}"
+            if est in _ADITIVOS:
+                columna, funcion = _ADITIVOS[est]
+                resultado[nombre] = grupos[f"{medida}_{columna}"].agg(funcion)
+            elif est == "mean":
+                resultado[nombre] = grupos[f"{medida}_suma"].sum() / grupos[f"{medida}_n"].sum()
+            else:
+                # Solo los cuantiles necesitan fusionar sketches
+                q = 0.5 if est == "median" else float(est)
+                resultado[nombre] = grupos.apply(_cuantil_grupo, medida, q, include_groups=False)
+    tabla = pd.DataFrame(resultado)
+    return tabla.reset_index() if por else tabla.reset_index(drop=True)
+
+
+def _caja(grupo, medida):
+    valores, pesos = fusionar(zip(grupo[f"{medida}_valores"], grupo[f"{medida}_pesos"]))
+    q1, mediana, q3 = (cuantil((valores, pesos), q) for q in (0.25, 0.5, 0.75))
+    # Bigotes de Tukey: el valor más extremo dentro de 1.5 IQR de la caja
+    limite_inf, limite_sup = q1 - 1.5 * (q3 - q1), q3 + 1.5 * (q3 - q1)
+    dentro = valores[(valores >= limite_inf) & (valores <= limite_sup)]
+    return pd.Series({
+        "n": grupo[f"{medida}_n"].sum(),
+        "min": grupo[f"{medida}_min"].min(),
+        "q1": q1,
+        "mediana": mediana,
+        "q3": q3,
+        "max": grupo[f"{medida}_max"].max(),
+        "bigote_inf": dentro.min() if len(dentro) else q1,
+        "bigote_sup": dentro.max() if len(dentro) else q3,
+    })
+
+
+def resumen_caja(celdas, por, medida):
+    # Cinco números (más bigotes y n) por grupo, para dibujar boxplots sin filas
+    if celdas.empty:
+        return pd.DataFrame(columns=[*por, "n", "min", "q1", "mediana", "q3", "max", "bigote_inf", "bigote_sup"])
+    grupos = celdas.groupby(list(por), observed=True, sort=True)
+    return grupos.apply(_caja, medida, include_groups=False).reset_index()
@@ -0,0 +1,231 @@
+"""Capa de datos de la app: lectura tipada de los workbooks y snapshot columnar.
+
+Ejecutar `python datos.py` compila todos los .xlsx de data/ a archivos Feather
+(Arrow IPC) dentro de data/snapshot/, que la app lee con memory-map, junto con
+el almacén unificado de estaciones (data/snapshot/estaciones.feather) y su
+cubo de agregados (data/snapshot/cubo.feather).
+"""
+import os
+
+import pandas as pd
+
+import cubo
+
+try:
+    import pyarrow.feather as feather
+except ImportError:  # sin pyarrow la app sigue leyendo los Excel
+    feather = None
+
+
+# ENSO_DATOS apunta las estaciones a otra carpeta (p. ej. datos escalados para
+# benchmarks); todas las rutas, incluido el snapshot, salen de DATA_DIR
+DATA_DIR = os.environ.get("ENSO_DATOS", "data")
+SNAPSHOT_DIR = os.path.join(DATA_DIR, "snapshot")
+ALMACEN = os.path.join(SNAPSHOT_DIR, "estaciones.feather")
+CUBO = os.path.join(SNAPSHOT_DIR, "cubo.feather")
+
+ARCHIVO_ESTACION = "Boxplot precipitacion y spi.xlsx"
+ARCHIVO_CLIMA = "Heatmap de correlación.xlsx"
+COLUMNAS_CLIMA = ["Temperatura (°C)", "Humedad (%)"]
+
+MESES_ES = [
+    "Enero", "Febrero", "Marzo", "Abril", "Mayo", "Junio",
+    "Julio", "Agosto", "Septiembre", "Octubre", "Noviembre", "Diciembre",
+]
+MESES_EN = [
+    "January", "February", "March", "April", "May", "June",
+    "July", "August", "September", "October", "November", "December",
+]
+FASES_ENSO = ["Niño", "Neutro", "Niña"]
+
+
+# --- Rutas ---
+def estaciones_en_disco():
+    carpetas = [
+        nombre for nombre in os.listdir(DATA_DIR)
+        if nombre.startswith("Estacion ") and os.path.isdir(os.path.join(DATA_DIR, nombre))
+    ]
+    return sorted(carpetas, key=lambda nombre: int(nombre.split(" ")[-1]))
+
+
+def ruta_archivo(estacion, archivo):
+    carpeta = os.path.join(DATA_DIR, estacion)
+    ruta = os.path.join(carpeta, archivo)
+    if os.path.exists(ruta) or not os.path.isdir(carpeta):
+        return ruta
+    # Algunas estaciones usan "Wavelet 1.xlsx" y otras "wavelet 1.xlsx"
+    for nombre in os.listdir(carpeta):
+        if nombre.lower() == archivo.lower():
+            return os.path.join(carpeta, nombre)
+    return ruta
+
+
+def ruta_snapshot(ruta):
+    relativa = os.path.relpath(ruta, DATA_DIR)
+    return os.path.join(SNAPSHOT_DIR, os.path.splitext(relativa)[0] + ".feather")
+
+
+def snapshot_vigente(ruta):
+    snap = ruta_snapshot(ruta)
+    return (
+        feather is not None
+        and os.path.exists(snap)
+        and os.path.getmtime(snap) >= os.path.getmtime(ruta)
+    )
+
+
+def firma(ruta):
+    # Cambia cuando cambia el Excel o cuando se recompila su snapshot
+    snap = ruta_snapshot(ruta)
+    return (
+        os.path.getmtime(ruta),
+        os.path.getmtime(snap) if os.path.exists(snap) else None,
+    )
+
+
+# --- Tipado ---
+def tipar(df):
+    df = df.copy()
+    if "FECHA" in df.columns:
+        df["FECHA"] = pd.to_datetime(df["FECHA"], errors="coerce")
+    for col in ("Fase_ENSO", "Fase ENSO"):
+        if col in df.columns:
+            df[col] = pd.Categorical(df[col], categories=FASES_ENSO)
+    if "Mes" in df.columns:
+        df["Mes"] = pd.Categorical(df["Mes"], categories=MESES_ES, ordered=True)
+    return df
+
+
+def normalizar(df):
+    df = df.rename(columns={"Precipitacion (mm)": "Precipitación", "FECHA": "Fecha"})
+    if "Fecha" in df.columns:
+        df["Fecha"] = pd.to_datetime(df["Fecha"])
+        df["Año"] = df["Fecha"].dt.year
+        df["Mes"] = pd.Categorical(df["Fecha"].dt.month_name(), categories=MESES_EN, ordered=True)
+    return df
+
+
+# --- Lectura ---
+def leer_tabla(ruta):
+    if snapshot_vigente(ruta):
+        return feather.read_table(ruta_snapshot(ruta), memory_map=True).to_pandas()
+    return tipar(pd.read_excel(ruta))
+
+
+# --- Almacén unificado de estaciones ---
+# Una sola tabla larga con todas las estaciones, indexada por (Estación, Fecha)
+# y ordenada, de modo que elegir N estaciones es un slice del índice.
+def fuentes_almacen():
+    rutas = []
+    for estacion in estaciones_en_disco():
+        rutas.append(ruta_archivo(estacion, ARCHIVO_ESTACION))
+        clima = ruta_archivo(estacion, ARCHIVO_CLIMA)
+        if os.path.exists(clima):
+            rutas.append(clima)
+    return rutas
+
+
+def firma_almacen():
+    return (
+        tuple(os.path.getmtime(ruta) for ruta in fuentes_almacen()),
+        os.path.getmtime(ALMACEN) if os.path.exists(ALMACEN) else None,
+    )
+
+
+def almacen_vigente():
+    return (
+        feather is not None
+        and os.path.exists(ALMACEN)
+        and os.path.getmtime(ALMACEN) >= max(os.path.getmtime(r) for r in fuentes_almacen())
+    )
+
+
+def _estacion_larga(estacion):
+    df = normalizar(leer_tabla(ruta_archivo(estacion, ARCHIVO_ESTACION)))
+    clima_ruta = ruta_archivo(estacion, ARCHIVO_CLIMA)
+    if os.path.exists(clima_ruta):
+        # Solo se toman temperatura y humedad: la precipitación y el SPI
+        # vienen del workbook principal de la estación
+        clima = leer_tabla(clima_ruta).dropna(subset=["Año", "Mes"])
+        clima = pd.DataFrame({
+            "Año": clima["Año"].astype(int),
+            "Mes_num": clima["Mes"].cat.codes + 1,
+            **{col: clima[col] for col in COLUMNAS_CLIMA if col in clima.columns},
+        })
+        df["Mes_num"] = df["Fecha"].dt.month
+        df = df.merge(clima, on=["Año", "Mes_num"], how="left").drop(columns="Mes_num")
+    df.insert(0, "Estación", estacion)
+    return df
+
+
+def construir_almacen():
+    partes = [_estacion_larga(estacion) for estacion in estaciones_en_disco()]
+    almacen = pd.concat(partes, ignore_index=True)
+    return almacen.set_index(["Estación", "Fecha"]).sort_index()
+
+
+def leer_almacen():
+    if almacen_vigente():
+        tabla = feather.read_table(ALMACEN, memory_map=True).to_pandas()
+        return tabla.set_index(["Estación", "Fecha"]).sort_index()
+    return construir_almacen()
+
+
+# --- Cubo de agregados ---
+def cubo_vigente():
+    return (
+        feather is not None
+        and os.path.exists(CUBO)
+        and os.path.getmtime(CUBO) >= max(os.path.getmtime(r) for r in fuentes_almacen())
+    )
+
+
+def leer_cubo():
+    if cubo_vigente():
+        return feather.read_table(CUBO, memory_map=True).to_pandas()
+    return cubo.construir_cubo(leer_almacen())
+
+
+def estaciones(almacen):
+    return sorted(almacen.index.unique("Estación"), key=lambda nombre: int(nombre.split(" ")[-1]))
+
+
+def consultar(almacen, estaciones):
+    return almacen.loc[list(estaciones)].reset_index()
+
+
+# --- Ingesta: Excel -> Feather ---
+def workbooks():
+    for raiz, carpetas, archivos in os.walk(DATA_DIR):
+        carpetas[:] = sorted(c for c in carpetas if os.path.join(raiz, c) != SNAPSHOT_DIR)
+        for nombre in sorted(archivos):
+            if nombre.lower().endswith(".xlsx") and not nombre.startswith("~$"):
+                yield os.path.join(raiz, nombre)
+
+
+def compilar_snapshot(forzar=False):
+    if feather is None:
+        raise ImportError("Se necesita pyarrow para compilar el snapshot columnar.")
+    compilados = []
+    for ruta in workbooks():
+        if not forzar and snapshot_vigente(ruta):
+            continue
+        destino = ruta_snapshot(ruta)
+        os.makedirs(os.path.dirname(destino), exist_ok=True)
+        df = tipar(pd.read_excel(ruta)).reset_index(drop=True)
+        feather.write_feather(df, destino, compression="uncompressed")
+        compilados.append(destino)
+    if forzar or not almacen_vigente() or not cubo_vigente():
+        os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+        almacen = construir_almacen()
+        feather.write_feather(almacen.reset_index(), ALMACEN, compression="uncompressed")
+        feather.write_feather(cubo.construir_cubo(almacen), CUBO, compression="uncompressed")
+        compilados += [ALMACEN, CUBO]
+    return compilados
+
+
+if __name__ == "__main__":
+    import sys
+
+    for destino in compilar_snapshot(forzar="--forzar" in sys.argv):
+        print(f"✔ {destino}")
@@ -0,0 +1,95 @@
+"""Exportación de figuras Plotly a PNG con un pool de renderizadores kaleido.
+
+Cada proceso del pool arranca kaleido una sola vez y lo mantiene caliente, así
+que las exportaciones no pagan el arranque del navegador en cada figura ni
+bloquean el hilo del script de Streamlit mientras se rasterizan.
+
+Cada proceso con su navegador ocupa memoria: por defecto hay uno solo (la
+instancia gratuita de Render tiene 512 MB). ENSO_PROCESOS_EXPORTACION=<n> lo
+cambia; solo con más de uno el ZIP de una estación se rasteriza en paralelo.
+Los procesos se crean con la primera exportación, no al arrancar.
+"""
+import io
+import multiprocessing
+import os
+import threading
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+
+import plotly.io as pio
+
+
+# --- Lado del worker ---
+def _iniciar_worker():
+    try:
+        # Un render de prueba confirma que kaleido (y su navegador) funcionan
+        pio.to_image(pio.from_json('{"data": [], "layout": {}}'), format="png")
+    except Exception:
+        # Sin navegador disponible cada render fallará con su propio error
+        return
+    import kaleido
+
+    # kaleido >= 1 puede dejar un navegador persistente por proceso
+    if hasattr(kaleido, "start_sync_server"):
+        kaleido.start_sync_server(silence_warnings=True)
+
+
+def _renderizar(fig_json, formato="png", escala=1):
+    fig = pio.from_json(fig_json)
+    return pio.to_image(fig, format=formato, scale=escala)
+
+
+# --- Pool ---
+def procesos_exportacion():
+    return max(1, int(os.environ.get("ENSO_PROCESOS_EXPORTACION", "1")))
+
+
+class PoolRender:
+    def __init__(self, procesos=None):
+        self.procesos = procesos or procesos_exportacion()
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def _pool(self):
+        # Se crea una sola vez, con la primera exportación de cualquier sesión
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.procesos,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_iniciar_worker,
+                )
+            return self._executor
+
+    def renderizar(self, fig, formato="png"):
+        return self._pool().submit(_renderizar, fig.to_json(), formato).result()
+
+    def renderizar_lote(self, figuras, formato="png"):
+        # figuras: {nombre: figura}; se reparten entre los procesos del pool. Con
+        # el valor por defecto (un proceso) se rasterizan una tras otra; en
+        # paralelo solo con ENSO_PROCESOS_EXPORTACION > 1
+        futuros = {
+            nombre: self._pool().submit(_renderizar, fig.to_json(), formato)
+            for nombre, fig in figuras.items()
+        }
+        return {nombre: futuro.result() for nombre, futuro in futuros.items()}
+
+    def zip(self, figuras, formato="png"):
+        # Secuencial por defecto, como renderizar_lote
+        imagenes = self.renderizar_lote(figuras, formato)
+        return empaquetar_zip({f"{nombre}.{formato}": datos for nombre, datos in imagenes.items()})
+
+    def cerrar(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+
+def empaquetar_zip(archivos):
+    buffer = io.BytesIO()
+    # Los PNG ya vienen comprimidos: ZIP_STORED evita gastar CPU en vano
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_STORED) as zf:
+        for nombre, datos in archivos.items():
+            zf.writestr(nombre, datos)
+    return buffer.getvalue()
@@ -0,0 +1,87 @@
+"""Motor de filtros por año, mes y fase ENSO sobre índices de bits.
+
+Cada valor de cada columna filtrable tiene precalculada su máscara de filas
+empaquetada en bits; filtrar es un OR de las máscaras elegidas por columna y un
+AND entre columnas. El resultado (las posiciones de las filas) se memoiza por
+tupla de filtros, así que repetir un filtro es solo un `take`.
+"""
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+
+COLUMNAS = ("Año", "Mes", "Fase_ENSO")
+
+
+class IndiceFiltros:
+    def __init__(self, df, columnas=COLUMNAS, max_entradas=256):
+        self.df = df
+        self.n = len(df)
+        self.valores = {}
+        self._bits = {}
+        for col in columnas:
+            if isinstance(df[col].dtype, pd.CategoricalDtype):
+                codigos = df[col].cat.codes.to_numpy()
+                categorias = df[col].cat.categories
+            else:
+                codigos, categorias = pd.factorize(df[col], sort=True)
+            presentes = np.unique(codigos[codigos >= 0])
+            # Una fila de bits por valor presente: (valores, ceil(n / 8)) en uint8
+            self.valores[col] = list(categorias[presentes])
+            self._bits[col] = {
+                valor: np.packbits(codigos == codigo)
+                for valor, codigo in zip(self.valores[col], presentes)
+            }
+        self._memo = OrderedDict()
+        self._max_entradas = max_entradas
+        self._lock = threading.Lock()
+
+    def _clave(self, filtros):
+        # None = sin filtrar esa columna; el orden de la selección no importa
+        return tuple(
+            (col, None if filtros.get(col) is None else frozenset(filtros[col]))
+            for col in self._bits
+        )
+
+    def _posiciones(self, clave):
+        bits = np.full((self.n + 7) // 8, 0xFF, dtype=np.uint8)
+        for col, seleccion in clave:
+            if seleccion is None:
+                continue
+            mascaras = [self._bits[col][v] for v in seleccion if v in self._bits[col]]
+            if not mascaras:
+                return np.empty(0, dtype=np.intp)
+            bits &= np.bitwise_or.reduce(mascaras)
+        return np.flatnonzero(np.unpackbits(bits, count=self.n))
+
+    def posiciones(self, **filtros):
+        clave = self._clave(filtros)
+        with self._lock:
+            if clave in self._memo:
+                self._memo.move_to_end(clave)
+                return self._memo[clave]
+        posiciones = self._posiciones(clave)
+        with self._lock:
+            self._memo[clave] = posiciones
+            while len(self._memo) > self._max_entradas:
+                self._memo.popitem(last=False)
+        return posiciones
+
+    def filtrar(self, columnas=None, **filtros):
+        # Devuelve siempre un DataFrame nuevo; el del índice se comparte
+        df = self.df if columnas is None else self.df[list(columnas)]
+        return df.take(self.posiciones(**filtros))
+
+
+def acotar(base, delta):
+    # Filtro de un gráfico dentro del filtro compartido: por columna, la
+    # intersección con la selección base; si queda vacía (p. ej. la base cambió
+    # y ya no contiene lo elegido) se usa la base completa
+    acotado = {}
+    for col, seleccion in base.items():
+        elegidos = delta.get(col)
+        comun = [v for v in seleccion if elegidos is None or v in elegidos]
+        acotado[col] = comun or list(seleccion)
+    return acotado
@@ -0,0 +1,267 @@
+"""Geometría y atributos por año del mapa interactivo.
+
+Ejecutar `python mapa.py` simplifica el contorno del Chocó Andino con
+Douglas-Peucker a la tolerancia del zoom del mapa y lo guarda en static/mapa/.
+Streamlit
+sirve esa carpeta como archivos estáticos: el Deck solo lleva la URL y el
+navegador descarga el contorno una vez, en lugar de recibir la geometría
+completa en cada interacción.
+
+Los colores, la criticidad y el ícono de cada estación se precalculan para
+todos los años de una sola vez; mover el año solo cambia esos pocos registros.
+Los íconos salen de un único sprite (static/iconos/estaciones.png) incluido en
+el repositorio, así que el mapa no depende de ningún CDN.
+"""
+import json
+import os
+
+import numpy as np
+
+
+GEOJSON = os.path.join("data", "choco_andino_export.geojson")
+STATIC_DIR = "static"
+MAPA_DIR = os.path.join(STATIC_DIR, "mapa")
+URL_STATIC = "app/static"
+# Streamlit no devuelve la vista del Deck, así que solo se sirve el nivel del
+# zoom inicial de la sección; añadir otro aquí lo genera en el build
+ZOOM_INICIAL = 8
+NIVELES_ZOOM = (ZOOM_INICIAL,)
+DECIMALES = 5  # ~1 m en el ecuador
+
+
+# --- Simplificación ---
+def tolerancia(zoom):
+    # Grados por píxel en el ecuador a ese zoom (teselas de 256 px)
+    return 360.0 / (256 * 2 ** zoom)
+
+
+def douglas_peucker(puntos, tol):
+    puntos = np.asarray(puntos, dtype=float)
+    if len(puntos) < 3:
+        return puntos
+    conservar = np.zeros(len(puntos), dtype=bool)
+    conservar[[0, -1]] = True
+    pila = [(0, len(puntos) - 1)]
+    while pila:
+        inicio, fin = pila.pop()
+        if fin - inicio < 2:
+            continue
+        a, b = puntos[inicio], puntos[fin]
+        medio = puntos[inicio + 1:fin]
+        ab = b - a
+        largo = np.hypot(*ab)
+        if largo == 0:
+            # Anillo cerrado: distancia al punto de partida
+            distancia = np.hypot(*(medio - a).T)
+        else:
+            distancia = np.abs(ab[0] * (medio[:, 1] - a[1]) - ab[1] * (medio[:, 0] - a[0])) / largo
+        i = int(np.argmax(distancia))
+        if distancia[i] > tol:
+            k = inicio + 1 + i
+            conservar[k] = True
+            pila += [(inicio, k), (k, fin)]
+    return puntos[conservar]
+
+
+def _anillos(poligono, tol):
+    anillos = []
+    for anillo in poligono:
+        simple = douglas_peucker(anillo, tol)
+        # Un anillo necesita al menos 4 vértices (cerrado); los menores desaparecen a ese zoom
+        if len(simple) >= 4:
+            anillos.append(np.round(simple, DECIMALES).tolist())
+    return anillos
+
+
+def simplificar(geojson, tol):
+    features = []
+    for feature in geojson["features"]:
+        geometria = feature["geometry"]
+        poligonos = geometria["coordinates"] if geometria["type"] == "MultiPolygon" else [geometria["coordinates"]]
+        simples = [p for p in (_anillos(poligono, tol) for poligono in poligonos) if p]
+        if simples:
+            features.append({
+                "type": "Feature",
+                "properties": {},
+                "geometry": {"type": "MultiPolygon", "coordinates": simples},
+            })
+    return {"type": "FeatureCollection", "features": features}
+
+
+# --- Niveles precalculados ---
+def ruta_nivel(zoom):
+    # .json para que el cargador de deck.gl lo reconozca por la extensión
+    return os.path.join(MAPA_DIR, f"choco_andino_z{zoom}.json")
+
+
+def nivel_vigente(zoom):
+    ruta = ruta_nivel(zoom)
+    return os.path.exists(ruta) and os.path.getmtime(ruta) >= os.path.getmtime(GEOJSON)
+
+
+def precalcular(forzar=False):
+    pendientes = [z for z in NIVELES_ZOOM if forzar or not nivel_vigente(z)]
+    if not pendientes:
+        return []
+    with open(GEOJSON, "r", encoding="utf-8") as f:
+        geojson = json.load(f)
+    os.makedirs(MAPA_DIR, exist_ok=True)
+    generados = []
+    for zoom in pendientes:
+        with open(ruta_nivel(zoom), "w", encoding="utf-8") as f:
+            json.dump(simplificar(geojson, tolerancia(zoom)), f, separators=(",", ":"))
+        generados.append(ruta_nivel(zoom))
+    return generados
+
+
+def url_contorno(zoom):
+    # Nivel más detallado que no exceda el zoom de la vista
+    nivel = max([z for z in NIVELES_ZOOM if z <= zoom] or [min(NIVELES_ZOOM)])
+    precalcular()
+    return f"{URL_STATIC}/mapa/{os.path.basename(ruta_nivel(nivel))}"
+
+
+# --- Atlas de íconos ---
+ATLAS = os.path.join(STATIC_DIR, "iconos", "estaciones.png")
+LADO_ICONO = 128
+ICONOS = ("peligro", "alerta", "normal")  # peligro máximo, leve alerta, estación normal
+MAPEO_ICONOS = {
+    nombre: {"x": i * LADO_ICONO, "y": 0, "width": LADO_ICONO, "height": LADO_ICONO, "anchorY": LADO_ICONO}
+    for i, nombre in enumerate(ICONOS)
+}
+
+
+def url_atlas():
+    return f"{URL_STATIC}/iconos/{os.path.basename(ATLAS)}"
+
+
+def dibujar_atlas(ruta=ATLAS):
+    # Regenera el sprite: se dibuja a 4x y se reduce para suavizar los bordes
+    from PIL import Image, ImageDraw
+
+    escala = 4
+    lado = LADO_ICONO * escala
+    hoja = Image.new("RGBA", (lado * len(ICONOS), lado), (0, 0, 0, 0))
+    dibujo = ImageDraw.Draw(hoja)
+    u = lado / 128
+
+    def triangulo(x0, relleno, signo):
+        dibujo.polygon([(x0 + 64 * u, 8 * u), (x0 + 122 * u, 118 * u), (x0 + 6 * u, 118 * u)],
+                       fill=relleno, outline=(40, 40, 40, 255), width=int(4 * u))
+        dibujo.rounded_rectangle([x0 + 56 * u, 42 * u, x0 + 72 * u, 88 * u], radius=6 * u, fill=signo)
+        dibujo.ellipse([x0 + 55 * u, 95 * u, x0 + 73 * u, 113 * u], fill=signo)
+
+    triangulo(0, (214, 39, 40, 255), (255, 255, 255, 255))
+    triangulo(lado, (255, 190, 30, 255), (40, 40, 40, 255))
+
+    # Estación normal: marcador con un anillo blanco
+    x0 = 2 * lado
+    dibujo.ellipse([x0 + 24 * u, 6 * u, x0 + 104 * u, 86 * u], fill=(31, 119, 180, 255))
+    dibujo.polygon([(x0 + 30 * u, 62 * u), (x0 + 98 * u, 62 * u), (x0 + 64 * u, 124 * u)], fill=(31, 119, 180, 255))
+    dibujo.ellipse([x0 + 44 * u, 26 * u, x0 + 84 * u, 66 * u], fill=(255, 255, 255, 255))
+    dibujo.ellipse([x0 + 54 * u, 36 * u, x0 + 74 * u, 56 * u], fill=(31, 119, 180, 255))
+
+    os.makedirs(os.path.dirname(ruta), exist_ok=True)
+    hoja.resize((LADO_ICONO * len(ICONOS), LADO_ICONO), Image.LANCZOS).save(ruta, optimize=True)
+    return ruta
+
+
+# --- Atributos de estaciones por año ---
+AÑOS = np.arange(1992, 2023)
+
+
+def criticidad(variable, valores):
+    if variable == "SPI":
+        return np.abs(valores)
+    if variable == "Humedad (%)":
+        return np.maximum(0, valores - 90)
+    if variable == "Temperatura (Â°C)":
+        return np.maximum(0, valores - 25)
+    return np.zeros_like(valores)
+
+
+def colores(variable, valores, vmin, vmax, paleta="RdYlBu"):
+    import matplotlib
+
+    # Escala continua para todas las celdas de una vez; los umbrales la reemplazan
+    norm = (valores - vmin) / (vmax - vmin) if vmax > vmin else np.zeros_like(valores)
+    rgba = (matplotlib.colormaps[paleta](np.nan_to_num(norm)) * 255).astype(int)
+    umbrales = {
+        "SPI": [(valores <= -1, [255, 0, 0, 255]), (valores >= 1, [0, 0, 200, 255])],
+        "Humedad (%)": [(valores >= 90, [128, 0, 128, 255])],
+        "Temperatura (Â°C)": [(valores >= 25, [255, 215, 0, 255])],
+    }
+    for mascara, color in umbrales.get(variable, []):
+        rgba[mascara] = color
+    return rgba
+
+
+def atributos_por_año(tablas, variable, años=AÑOS):
+    # tablas: {estación: Resumen_Anual}. Devuelve matrices años × estaciones
+    estaciones = [nombre for nombre, df in tablas.items() if variable in df.columns]
+    valores = np.full((len(años), len(estaciones)), np.nan)
+    for j, nombre in enumerate(estaciones):
+        serie = tablas[nombre].dropna(subset=["Año"]).groupby("Año")[variable].first()
+        valores[:, j] = serie.reindex(años).to_numpy(dtype=float)
+
+    todos = np.concatenate([tablas[n][variable].dropna().to_numpy(dtype=float) for n in estaciones] or [[]])
+    vmin, vmax = (todos.min(), todos.max()) if len(todos) else (np.nan, np.nan)
+
+    crit = criticidad(variable, valores)
+    # Rango 1 = más crítica del año; las estaciones sin dato quedan al final
+    orden = np.argsort(-np.where(np.isnan(crit), -np.inf, crit), axis=1, kind="stable")
+    rango = np.empty_like(orden)
+    np.put_along_axis(rango, orden, np.arange(1, len(estaciones) + 1)[None, :], axis=1)
+
+    icono = np.full(valores.shape, "normal", dtype=object)
+    con_dato = ~np.isnan(crit)
+    filas = np.flatnonzero(con_dato.any(axis=1))
+    menos = np.nanargmin(np.where(con_dato, crit, np.nan)[filas], axis=1) if len(filas) else []
+    mas = np.nanargmax(np.where(con_dato, crit, np.nan)[filas], axis=1) if len(filas) else []
+    icono[filas, menos] = "alerta"
+    icono[filas, mas] = "peligro"  # si coinciden, gana peligro
+
+    return {
+        "años": np.asarray(años),
+        "estaciones": estaciones,
+        "valor": valores,
+        "color": colores(variable, valores, vmin, vmax),
+        "criticidad": crit,
+        "rango": rango,
+        "icono": icono,
+        "vmin": vmin,
+        "vmax": vmax,
+    }
+
+
+def registros(atributos, año, coords):
+    # Registros de un año para las capas del Deck (solo estaciones con dato)
+    i = int(np.searchsorted(atributos["años"], año))
+    filas = []
+    for j, nombre in enumerate(atributos["estaciones"]):
+        valor = atributos["valor"][i, j]
+        if np.isnan(valor):
+            continue
+        lon, lat = coords[nombre]
+        filas.append({
+            "name": nombre,
+            "latitude": lat,
+            "longitude": lon,
+            "elevation": 10000,
+            "color": atributos["color"][i, j].tolist(),
+            "value": round(float(valor), 2),
+            "rango": int(atributos["rango"][i, j]),
+            "año": int(año),
+            "icon_data": atributos["icono"][i, j],  # clave en MAPEO_ICONOS
+        })
+    return filas
+
+
+if __name__ == "__main__":
+    import sys
+
+    generados = precalcular(forzar="--forzar" in sys.argv)
+    if "--atlas" in sys.argv or not os.path.exists(ATLAS):
+        generados.append(dibujar_atlas())
+    for ruta in generados:
+        print(f"✔ {ruta} ({os.path.getsize(ruta) / 1024:.0f} KB)")
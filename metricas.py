@@ -0,0 +1,133 @@
+"""Tiempos de pared por sección y etapa de cada ejecución de la app.
+
+Las etapas son import (primera apertura de la sección), carga, transformacion,
+figura, exportacion y render; `seccion` cubre la ejecución completa. Cada
+medición guarda además el tamaño en bytes de lo que produjo, cuando se conoce
+(la figura enviada al navegador, el PNG o el ZIP exportado).
+
+app.py muestra las mediciones de la ejecución en un panel de desarrollador
+(`?dev=1` en la URL) y, al terminar, las exporta si están definidas:
+
+- ENSO_METRICAS_JSONL=<ruta>: añade una línea JSON por medición.
+- ENSO_METRICAS_PROM=<ruta>: reescribe los acumulados del proceso en el formato
+  de texto de Prometheus. Con `static/metricas.txt` el archivo se puede leer en
+  /app/static/metricas.txt.
+"""
+import functools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+
+ETAPAS = ("import", "carga", "transformacion", "figura", "exportacion", "render", "seccion")
+
+# Cada sesión de Streamlit ejecuta su script en su propio hilo
+_local = threading.local()
+_totales = {}  # (sección, etapa, detalle) -> [n, segundos, bytes]
+_lock = threading.Lock()
+
+
+# --- Ejecución actual ---
+def iniciar(seccion, detallado=False):
+    _local.seccion = seccion
+    _local.detallado = detallado
+    _local.nivel = 0
+    _local.mediciones = []
+
+
+def mediciones():
+    return list(getattr(_local, "mediciones", []))
+
+
+def detallado():
+    # Medir bytes cuesta una serialización extra: solo con el panel o la exportación
+    return getattr(_local, "detallado", False) or exportacion_activa()
+
+
+@contextmanager
+def etapa(nombre, detalle=""):
+    medicion = {
+        "seccion": getattr(_local, "seccion", None),
+        "etapa": nombre,
+        "detalle": detalle,
+        "nivel": getattr(_local, "nivel", 0),
+        "ms": None,
+        "bytes": None,
+    }
+    # Se registra al empezar, así la lista queda en orden de inicio (padre antes que hijos)
+    if hasattr(_local, "mediciones"):
+        _local.mediciones.append(medicion)
+    _local.nivel = medicion["nivel"] + 1
+    inicio = time.perf_counter()
+    try:
+        yield medicion
+    finally:
+        medicion["ms"] = (time.perf_counter() - inicio) * 1e3
+        _local.nivel = medicion["nivel"]
+
+
+def medir(nombre, detalle=None):
+    # Decorador: cada llamada a la función es una medición de la etapa `nombre`
+    def decorador(funcion):
+        @functools.wraps(funcion)
+        def envoltura(*args, **kwargs):
+            with etapa(nombre, detalle or funcion.__name__):
+                return funcion(*args, **kwargs)
+        return envoltura
+    return decorador
+
+
+# --- Exportación ---
+def exportacion_activa():
+    return bool(os.environ.get("ENSO_METRICAS_JSONL") or os.environ.get("ENSO_METRICAS_PROM"))
+
+
+def exportar():
+    lista = mediciones()
+    if not lista or not exportacion_activa():
+        return
+    with _lock:
+        for m in lista:
+            total = _totales.setdefault((m["seccion"], m["etapa"], m["detalle"]), [0, 0.0, 0])
+            total[0] += 1
+            total[1] += m["ms"] / 1e3
+            total[2] += m["bytes"] or 0
+        ruta = os.environ.get("ENSO_METRICAS_JSONL")
+        if ruta:
+            marca = time.strftime("%Y-%m-%dT%H:%M:%S%z")
+            with open(ruta, "a", encoding="utf-8") as f:
+                for m in lista:
+                    f.write(json.dumps({"ts": marca, **m}, ensure_ascii=False) + "\n")
+        ruta = os.environ.get("ENSO_METRICAS_PROM")
+        if ruta:
+            # Escritura atómica: quien lo lea nunca ve un archivo a medias
+            os.makedirs(os.path.dirname(ruta) or ".", exist_ok=True)
+            with open(ruta + ".tmp", "w", encoding="utf-8") as f:
+                f.write(prometheus())
+            os.replace(ruta + ".tmp", ruta)
+
+
+def _etiquetas(seccion, etapa, detalle):
+    def escapar(valor):
+        return str(valor).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+    return f'seccion="{escapar(seccion)}",etapa="{escapar(etapa)}",detalle="{escapar(detalle)}"'
+
+
+def prometheus():
+    lineas = [
+        "# HELP enso_etapa_segundos Tiempo de pared por sección y etapa.",
+        "# TYPE enso_etapa_segundos summary",
+    ]
+    for clave, (n, segundos, _) in sorted(_totales.items(), key=str):
+        lineas.append(f"enso_etapa_segundos_count{{{_etiquetas(*clave)}}} {n}")
+        lineas.append(f"enso_etapa_segundos_sum{{{_etiquetas(*clave)}}} {segundos:.6f}")
+    lineas += [
+        "# HELP enso_etapa_bytes_total Bytes producidos por etapa (figuras enviadas, PNG, ZIP).",
+        "# TYPE enso_etapa_bytes_total counter",
+    ]
+    for clave, (_, _, bytes_) in sorted(_totales.items(), key=str):
+        if bytes_:
+            lineas.append(f"enso_etapa_bytes_total{{{_etiquetas(*clave)}}} {bytes_}")
+    return "\n".join(lineas) + "\n"
@@ -0,0 +1,65 @@
+"""Rectas de mínimos cuadrados en forma cerrada, por grupo y sin statsmodels.
+
+Cada ajuste sale de las sumas n, Σx, Σy, Σx², Σxy y Σy² de su grupo (una sola
+pasada agrupada), con los datos centrados en la media global para no perder
+precisión.
+"""
+import numpy as np
+import pandas as pd
+
+
+def ajustar_grupos(df, x, y, por=None):
+    # Una fila por grupo: n, pendiente, intercepto, r2, x_min, x_max
+    columnas = [x, y] + ([por] if por else [])
+    datos = df[columnas].dropna(subset=[x, y])
+    xs, ys = datos[x].to_numpy(dtype=float), datos[y].to_numpy(dtype=float)
+    mx, my = (xs.mean(), ys.mean()) if len(xs) else (0.0, 0.0)
+    xc, yc = xs - mx, ys - my
+    sumas = pd.DataFrame({
+        "n": 1, "sx": xc, "sy": yc, "sxx": xc * xc, "sxy": xc * yc, "syy": yc * yc,
+        "x_min": xs, "x_max": xs,
+    })
+    if por:
+        sumas[por] = datos[por].array
+        grupos = sumas.groupby(por, observed=True, sort=True)
+    else:
+        grupos = sumas.groupby(np.zeros(len(sumas)))
+    s = grupos.agg({
+        "n": "sum", "sx": "sum", "sy": "sum", "sxx": "sum", "sxy": "sum", "syy": "sum",
+        "x_min": "min", "x_max": "max",
+    })
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        sxx = s["sxx"] - s["sx"] ** 2 / s["n"]
+        sxy = s["sxy"] - s["sx"] * s["sy"] / s["n"]
+        syy = s["syy"] - s["sy"] ** 2 / s["n"]
+        pendiente = sxy / sxx
+        # Intercepto en las unidades originales (se deshace el centrado)
+        intercepto = (s["sy"] - pendiente * s["sx"]) / s["n"] + my - pendiente * mx
+        r2 = sxy ** 2 / (sxx * syy)
+    ajustes = pd.DataFrame({
+        "n": s["n"], "pendiente": pendiente, "intercepto": intercepto, "r2": r2,
+        "x_min": s["x_min"], "x_max": s["x_max"],
+    })
+    return ajustes.reset_index() if por else ajustes.reset_index(drop=True)
+
+
+def ajustar(x, y):
+    # Ajuste único: dict con n, pendiente, intercepto, r2, x_min y x_max
+    fila = ajustar_grupos(pd.DataFrame({"x": x, "y": y}), "x", "y").iloc[0]
+    return fila.to_dict()
+
+
+def traza_tendencia(ajuste, nombre, color, etiqueta_x="x", etiqueta_y="y"):
+    # Recta entre x_min y x_max con la misma información de hover que px
+    import plotly.graph_objects as go
+
+    x = np.array([ajuste["x_min"], ajuste["x_max"]])
+    texto = (
+        f"<b>OLS trendline</b><br>{etiqueta_y} = {ajuste['pendiente']:.6g} * {etiqueta_x} "
+        f"+ {ajuste['intercepto']:.6g}<br>R<sup>2</sup>={ajuste['r2']:.6f}"
+    )
+    return go.Scatter(
+        x=x, y=ajuste["intercepto"] + ajuste["pendiente"] * x, mode="lines", name=nombre,
+        line=dict(color=color), showlegend=False, hovertemplate=texto + "<extra></extra>",
+    )
@@ -0,0 +1,30 @@
+"""Secciones de la app, una por opción del menú lateral.
+
+Cada sección es un módulo con una función `mostrar()` y sus propios imports
+(plotly, pydeck, pywt, matplotlib...). El módulo se importa la primera vez que
+se abre la sección, así que el arranque en frío solo paga streamlit y la
+sección inicial.
+"""
+import importlib
+
+import metricas
+
+
+SECCIONES = {
+    "📘 Introducción": "introduccion",
+    "📈 Análisis Gráfico": "analisis_grafico",
+    "📊 Comparar Estaciones": "comparar",
+    "🌿 NDVI - Análisis Anual": "ndvi",
+    "📊 Correlaciones": "correlaciones",
+    "🌊 Wavelet": "analisis_wavelet",
+    "🗺️ Mapa Interactivo": "mapa_interactivo",
+}
+
+
+def cargar(opcion):
+    with metricas.etapa("import", SECCIONES[opcion]):
+        return importlib.import_module(f"{__name__}.{SECCIONES[opcion]}")
+
+
+def mostrar(opcion):
+    cargar(opcion).mostrar()
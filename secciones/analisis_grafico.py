@@ -0,0 +1,311 @@
+"""📈 Análisis Gráfico: boxplots, series, dispersión y panel de una estación."""
+import numpy as np
+import plotly.express as px
+import streamlit as st
+
+import cubo
+import datos
+import filtros
+import metricas
+import regresion
+from secciones.comun import (
+    anual_por_fase,
+    boton_exportar,
+    celdas_cubo,
+    indice_filtros,
+    lista_estaciones,
+    mostrar_grafico,
+    sin_datos,
+)
+from secciones.graficos import (
+    boton_zip_estacion,
+    filas_para_puntos,
+    grafico_barras_anuales,
+    grafico_boxplot_fase,
+    grafico_dispersion,
+    grafico_serie_precipitacion,
+    grafico_serie_spi,
+    modo_render,
+    rango_visible,
+    serie_reducida,
+    traza_scatter,
+)
+
+
+# Rectas SPI vs precipitación por fase, memoizadas por estación y filtro
+@st.cache_data(show_spinner=False, max_entries=128)
+def _ajustes_fase(estacion, clave_filtro, version):
+    df = indice_filtros(estacion).filtrar(["SPI", "Precipitación", "Fase_ENSO"], **dict(clave_filtro))
+    return regresion.ajustar_grupos(df, "SPI", "Precipitación", por="Fase_ENSO")
+
+
+@metricas.medir("transformacion")
+def ajustes_fase(estacion, filtro):
+    clave = tuple((col, tuple(sorted(valores))) for col, valores in sorted(filtro.items()))
+    return _ajustes_fase(estacion, clave, datos.firma_almacen())
+
+
+def mostrar():
+    st.markdown("## 📈 Análisis Gráfico por Estación")
+
+    estaciones = lista_estaciones()
+    estacion_sel = st.selectbox("🌍 Selecciona una estación:", estaciones)
+# --- Submenú de análisis gráfico ---
+    try:
+        # Cargar y preparar datos (slice del almacén unificado con su índice de filtros)
+        indice = indice_filtros(estacion_sel)
+        df_box = indice.df
+
+        analisis = st.selectbox("🔍 Elige qué análisis deseas visualizar:", [
+            "📦 Boxplots",
+            "📉 Series Temporales",
+            "📎 Dispersión SPI vs Precipitación",
+            "🧭 Panel Climático",
+            "🛠️ Visualizador Personalizado"
+        ])
+        
+        # Función de filtro visual elegante
+        def selector_filtros(valores, key, titulo="🎛️ Filtros", expanded=False):
+            with st.expander(titulo, expanded=expanded):
+                col1, col2, col3 = st.columns(3)
+                with col1:
+                    años = st.multiselect(
+                        "Años",
+                        valores["Año"],
+                        default=valores["Año"],
+                        key=f"{key}_a",
+                    )
+                with col2:
+                    meses = st.multiselect(
+                        "Meses",
+                        valores["Mes"],
+                        default=valores["Mes"],
+                        key=f"{key}_m",
+                    )
+                with col3:
+                    fases = st.multiselect(
+                        "Fase ENSO",
+                        valores["Fase_ENSO"],
+                        default=valores["Fase_ENSO"],
+                        key=f"{key}_f",
+                    )
+            return {"Año": años, "Mes": meses, "Fase_ENSO": fases}
+
+        # Filtros vinculados: un único filtro por estación, evaluado una vez
+        # por rerun; cada gráfico solo puede acotarlo (delta sobre el subconjunto)
+        vinculados = st.checkbox("🔗 Filtros vinculados (un mismo filtro para todos los gráficos)", key="filtros_vinculados")
+        if vinculados:
+            filtro_global = selector_filtros(indice.valores, f"global_{estacion_sel}", "🎛️ Filtros de la estación", expanded=True)
+            df_compartido = indice.filtrar(**filtro_global)
+
+        # Devuelve el subconjunto y el filtro efectivo (para consultar el cubo)
+        def aplicar_filtros(indice, key):
+            if not vinculados:
+                filtro = selector_filtros(indice.valores, key)
+                return indice.filtrar(**filtro), filtro
+            # Las opciones del delta son la selección global: elegir es intersecar.
+            # Si la global se acota después, lo que quede fuera no cuenta
+            delta = selector_filtros(filtro_global, f"{key}_delta", "🎛️ Ajuste de este gráfico")
+            delta = filtros.acotar(filtro_global, delta)
+            if all(len(delta[col]) == len(filtro_global[col]) for col in delta):
+                return df_compartido, filtro_global
+            return indice.filtrar(**delta), delta
+            
+        if analisis == "📦 Boxplots":
+            # 📦 Boxplot Precipitación
+            st.subheader("📦 Boxplot de Precipitación")
+            ver_puntos = st.checkbox("🔘 Mostrar observaciones individuales", key="box_puntos")
+            df_ppt, filtro_ppt = aplicar_filtros(indice, "box_ppt")
+            celdas_ppt = celdas_cubo([estacion_sel], filtro_ppt)
+            if not sin_datos(celdas_ppt):
+                fig1 = grafico_boxplot_fase(celdas_ppt, "Precipitación", filas_para_puntos(df_ppt, ver_puntos))
+                mostrar_grafico(fig1, use_container_width=True)
+                boton_exportar(fig1, "boxplot_precipitacion")
+
+    # Interpretación
+                med_ppt = cubo.resumir(celdas_ppt, ["Fase_ENSO"], {"Precipitación": ["median"]})
+                med_ppt = med_ppt.set_index("Fase_ENSO")["Precipitación_median"]
+                med_nino = med_ppt.get("Niño", np.nan)
+                med_nina = med_ppt.get("Niña", np.nan)
+                med_neutro = med_ppt.get("Neutro", np.nan)
+                st.info(f"🔎 Medianas: Niño = {med_nino:.1f} mm, Niña = {med_nina:.1f} mm, Neutro = {med_neutro:.1f} mm.")
+
+            # 📦 Boxplot SPI
+            st.subheader("📦 Boxplot de SPI")
+            df_spi_box, filtro_spi_box = aplicar_filtros(indice, "box_spi")
+            celdas_spi = celdas_cubo([estacion_sel], filtro_spi_box)
+            if not sin_datos(celdas_spi):
+                fig2 = grafico_boxplot_fase(celdas_spi, "SPI", filas_para_puntos(df_spi_box, ver_puntos))
+                mostrar_grafico(fig2, use_container_width=True)
+            
+                boton_exportar(fig2, "boxplot_spi")
+
+                med_spi = cubo.resumir(celdas_spi, ["Fase_ENSO"], {"SPI": ["median"]})
+                med_spi = med_spi.set_index("Fase_ENSO")["SPI_median"].round(2)
+                st.info(f"🔎 Mediana SPI por fase ENSO: {med_spi.to_dict()}")
+
+            # 📉 Serie SPI
+            
+            
+        elif analisis == "📉 Series Temporales": 
+            st.subheader("📉 Serie Temporal SPI")
+            valores_spi = filtro_global if vinculados else indice.valores
+            with st.expander("🎛️ Filtros", expanded=False):
+                años_spi = st.multiselect(
+                    "Años SPI",
+                    valores_spi["Año"],
+                    default=valores_spi["Año"],
+                    key="serie_spi_delta" if vinculados else "serie_spi",
+                )
+            filtro_spi = filtros.acotar(filtro_global, {"Año": años_spi}) if vinculados else {"Año": años_spi}
+            df_spi_f = indice.filtrar(["Fecha", "SPI"], **filtro_spi)
+            fig3 = grafico_serie_spi(rango_visible(df_spi_f, "serie_spi"))
+            mostrar_grafico(fig3, use_container_width=True)
+            boton_exportar(fig3, "serie_spi")
+            # 🌧️ Serie Precipitación
+            st.subheader("🌧️ Serie Temporal Precipitación")
+            df_precip_linea, _ = aplicar_filtros(indice, "serie_ppt")
+            fig4 = grafico_serie_precipitacion(rango_visible(df_precip_linea, "serie_ppt"))
+            mostrar_grafico(fig4, use_container_width=True)
+            boton_exportar(fig4, "serie_precipitacion")
+
+
+        elif analisis == "📎 Dispersión SPI vs Precipitación":
+            # 📊 Barras anuales
+            st.subheader("📊 Precipitación Anual Acumulada")
+            _, filtro_barras = aplicar_filtros(indice, "barras")
+            celdas_barras = celdas_cubo([estacion_sel], filtro_barras)
+            if not sin_datos(celdas_barras):
+                fig5 = grafico_barras_anuales(anual_por_fase(celdas_barras))
+                mostrar_grafico(fig5, use_container_width=True)
+                boton_exportar(fig5, "barras_anuales")
+
+            # 📎 Dispersión SPI vs Precipitación
+            st.subheader("📎 Relación SPI vs Precipitación")
+            df_disp, filtro_disp = aplicar_filtros(indice, "dispersion")
+            ajustes = ajustes_fase(estacion_sel, filtro_disp)
+            fig6 = grafico_dispersion(df_disp, ajustes)
+            mostrar_grafico(fig6, use_container_width=True)
+            with st.expander("📐 Ajuste lineal por fase ENSO"):
+                st.dataframe(
+                    ajustes[["Fase_ENSO", "n", "pendiente", "intercepto", "r2"]].round(4),
+                    hide_index=True, use_container_width=True,
+                )
+            boton_exportar(fig6, "dispersión_spi_precipitacion")
+        
+        elif analisis == "🧭 Panel Climático":
+# ===================== 🌎 DASHBOARD CLIMÁTICO =====================
+            st.markdown("---")
+            st.markdown("<h3 style='color:#1f4e79;'>🧭 Panel Climático Resumen</h3>", unsafe_allow_html=True)
+
+            # Con filtros vinculados el panel resume el subconjunto compartido
+            df_panel = df_compartido if vinculados else df_box
+
+            celdas_panel = celdas_cubo([estacion_sel], filtro_global if vinculados else None)
+
+            if not sin_datos(celdas_panel):
+                # --- KPIs (desde el cubo de agregados)
+                kpis = cubo.resumir(celdas_panel, [], {"SPI": ["median", "min", "max"], "Precipitación": ["sum"]})
+                spi_median = kpis["SPI_median"].iloc[0]
+                spi_min = kpis["SPI_min"].iloc[0]
+                spi_max = kpis["SPI_max"].iloc[0]
+                ppt_total = kpis["Precipitación_sum"].iloc[0]
+                años_unicos = celdas_panel["Año"].nunique()
+
+                # Clasificación climática
+                if spi_median <= -1:
+                    categoria = "🌵 Seca"
+                elif -1 < spi_median < 1:
+                    categoria = "🌤️ Normal"
+                else:
+                    categoria = "🌧️ Húmeda"
+
+                # --- Mini gráfico SPI mensual
+                fig_spi = px.line(serie_reducida(df_panel, "SPI")[0], x="Fecha", y="SPI", title="", height=200,
+                                render_mode=modo_render(len(df_panel)),
+                                color_discrete_sequence=["royalblue"])
+                fig_spi.update_layout(
+                    margin=dict(l=10, r=10, t=20, b=20),
+                    xaxis_title="",
+                    yaxis_title="SPI",
+                    template="simple_white"
+                )
+
+                # --- Precipitación anual acumulada
+                df_anual = cubo.resumir(celdas_panel, ["Año"], {"Precipitación": ["sum"]})
+                df_anual = df_anual.rename(columns={"Precipitación_sum": "Precipitación"})
+                fig_ppt = px.bar(df_anual, x="Año", y="Precipitación",
+                                title="📊 Precipitación Anual Acumulada",
+                                color_discrete_sequence=["mediumseagreen"],
+                                height=250)
+                fig_ppt.update_layout(template="plotly_white")
+
+                # --- Layout de tarjetas e indicadores
+                col1, col2, col3, col4, col5 = st.columns(5)
+
+                col1.metric("📉 SPI (mediana)", f"{spi_median:.2f}")
+                col2.metric("🧭 Clasificación", categoria)
+                col3.metric("🔽 SPI mínimo", f"{spi_min:.2f}")
+                col4.metric("🔼 SPI máximo", f"{spi_max:.2f}")
+                col5.metric("🌧️ Precipitación total", f"{ppt_total:,.0f} mm")
+
+                # --- Mostrar gráficos
+                col6, col7 = st.columns(2)
+                with col6:
+                    mostrar_grafico(fig_spi, use_container_width=True)
+                with col7:
+                    mostrar_grafico(fig_ppt, use_container_width=True)
+
+        elif analisis == "🛠️ Visualizador Personalizado":
+            st.markdown("---")
+            st.subheader("🛠️ Visualizador de Gráficos Personalizado")
+
+            df_custom, _ = aplicar_filtros(indice, "grafico_custom")
+
+            # Variables disponibles
+            variables_numericas = ["SPI", "Precipitación"]
+            variables_x = ["Fecha", "Año", "Mes", "SPI", "Precipitación"]
+
+            colx, coly, coltipo = st.columns(3)
+
+            with colx:
+                eje_x = st.selectbox("📌 Eje X:", variables_x, index=0)
+            with coly:
+                eje_y = st.multiselect("📈 Eje Y (puedes elegir varias):", variables_numericas, default=["SPI"])
+            with coltipo:
+                tipo = st.radio("📊 Tipo de gráfico:", ["Línea", "Dispersión", "Barras"], horizontal=True)
+
+            # Series largas en el tiempo: rango visible + reducción por variable
+            por_fecha = eje_x == "Fecha" and tipo != "Barras"
+            if por_fecha:
+                df_custom = rango_visible(df_custom, "grafico_custom")
+
+            # Construcción del gráfico dinámico
+            fig = px.line()  # Base vacía
+
+            for y in eje_y:
+                df_y, reducida = serie_reducida(df_custom, y) if por_fecha else (df_custom, False)
+                if tipo == "Línea":
+                    fig.add_trace(traza_scatter(len(df_custom), x=df_y[eje_x], y=df_y[y], name=y,
+                                                mode="lines" if reducida else "lines+markers"))
+                elif tipo == "Dispersión":
+                    fig.add_trace(traza_scatter(len(df_custom), x=df_y[eje_x], y=df_y[y], name=y, mode="markers"))
+                elif tipo == "Barras":
+                    fig.add_bar(x=df_custom[eje_x], y=df_custom[y], name=y)
+
+            fig.update_layout(
+                title="📊 Gráfico Personalizado",
+                xaxis_title=eje_x,
+                yaxis_title="Valor",
+                legend_title="Variables",
+                template="plotly_white"
+            )
+
+            mostrar_grafico(fig, use_container_width=True)
+
+        # --- Descarga de todos los gráficos de la estación ---
+        st.markdown("---")
+        boton_zip_estacion(estacion_sel)
+
+    except Exception as e:
+        st.error(f"❌ Error al cargar datos: {e}")
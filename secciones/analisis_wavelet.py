@@ -0,0 +1,155 @@
+"""🌊 Wavelet: escalograma, espectro global y coherencia con ENSO."""
+import numpy as np
+import plotly.express as px
+import streamlit as st
+
+import datos
+import metricas
+import wavelet
+from secciones.comun import boton_diferido, consultar_estaciones, lista_estaciones, mostrar_grafico
+from secciones.graficos import modo_render
+
+
+# PNG a 300 dpi del escalograma completo; la clave identifica la matriz
+@st.cache_data(show_spinner="🖼️ Generando imagen...", max_entries=16)
+def _png_wavelet(clave, _magnitud, vmax, paleta, titulo):
+    return wavelet.png_escalograma(_magnitud, vmax, paleta, titulo)
+
+
+def mostrar():
+    st.title("🌊 Análisis Wavelet por Estación (con PyWavelets)")
+
+    # === Estaciones disponibles ===
+    estaciones = lista_estaciones()
+    estacion_sel = st.selectbox("📍 Selecciona una estación:", estaciones)
+
+    if not estaciones:
+        st.error("❌ No hay estaciones disponibles para el análisis.")
+    else:
+        try:
+            df = consultar_estaciones([estacion_sel])
+            df = df.dropna(subset=["Fecha"])
+
+            # Variables numéricas disponibles
+            variables = wavelet.variables(df)
+            if not variables:
+                st.warning("⚠️ No hay variables numéricas para analizar.")
+            else:
+                col1, col2, col5 = st.columns(3)
+                with col1:
+                    variable = st.selectbox("📊 Variable a analizar:", variables)
+                with col2:
+                    wavelet_type = st.selectbox("🌐 Tipo de wavelet:", wavelet.WAVELETS, index=0)
+                with col5:
+                    motor = st.selectbox("⚙️ Motor de cálculo:", list(wavelet.MOTORES), index=0)
+
+                col3, col4 = st.columns(2)
+                with col3:
+                    num_escala = st.slider("🔍 Número de escalas", min_value=32, max_value=256, value=128, step=16)
+                with col4:
+                    colormap = st.selectbox("🎨 Paleta de colores", ["coolwarm", "viridis", "plasma", "inferno", "cividis"], index=0)
+
+                col6, col7 = st.columns(2)
+                with col6:
+                    mostrar_sig = st.checkbox("🔬 Contornos de significancia al 95 % (ruido rojo)", value=False)
+                with col7:
+                    n_sims = st.select_slider("🎲 Simulaciones Monte Carlo", options=[100, 200], value=100)
+
+                signal = wavelet.preparar_senal(df[variable])
+                indice = wavelet.indice_enso(df)
+                version = datos.firma_almacen()
+                escalas = np.arange(1, num_escala)
+
+                # Umbrales de significancia: simulaciones AR(1), en paralelo si ENSO_PROCESOS_SIGNIFICANCIA > 1
+                umbrales = None
+                if mostrar_sig:
+                    sims_efectivas = wavelet.simulaciones_permitidas(n_sims, num_escala)
+                    if sims_efectivas < n_sims:
+                        st.caption(f"ℹ️ Con {num_escala} escalas se simulan {sims_efectivas} series de ruido rojo.")
+                        n_sims = sims_efectivas
+                    with st.spinner("🎲 Simulando ruido rojo..."), metricas.etapa("transformacion", "significancia"):
+                        umbrales = wavelet.significancia_cacheada(
+                            (estacion_sel, variable, wavelet_type, num_escala, n_sims, version),
+                            signal, wavelet_type, num_escala, senal_y=indice, n_sims=n_sims,
+                        )
+
+                # --- Serie original ---
+                fig2 = px.line(x=df["Fecha"], y=signal, title=f"Serie Temporal Original - {variable}",
+                               color_discrete_sequence=["steelblue"], height=300, render_mode=modo_render(len(signal)))
+                fig2.update_layout(xaxis_title="Fecha", yaxis_title=variable, template="plotly_white")
+                mostrar_grafico(fig2, use_container_width=True)
+
+                # --- Transformada Wavelet Continua ---
+                # |coef| y el recorte al percentil 99 se comparten entre sesiones:
+                # cambiar solo la paleta de colores ya no recalcula la CWT
+                with metricas.etapa("transformacion", "cwt"):
+                    magnitud, vmax = wavelet.magnitud(
+                        estacion_sel, variable, wavelet_type, num_escala, signal,
+                        version=version, motor=wavelet.MOTORES[motor]
+                    )
+
+                # En pantalla se envía un heatmap interactivo reducido a resolución de pantalla
+                titulo = f"Wavelet Transform ({variable}) - {wavelet_type}"
+                contorno = magnitud.astype(float) ** 2 / umbrales["potencia"][:, None] if umbrales else None
+                with metricas.etapa("figura", "escalograma"):
+                    fig = wavelet.figura_escalograma(magnitud, vmax, df["Fecha"], colormap, titulo, contorno=contorno)
+                mostrar_grafico(fig, use_container_width=True)
+
+                # --- Descargar imagen ---
+                # El PNG a 300 dpi con la matriz completa solo se rasteriza si se pide
+                clave_png = (estacion_sel, variable, wavelet_type, num_escala, motor, colormap, version)
+                boton_diferido(
+                    "wavelet",
+                    clave_png,
+                    lambda: _png_wavelet(clave_png, magnitud, vmax, colormap, titulo),
+                    "📅 Descargar gráfico Wavelet",
+                    f"wavelet_{estacion_sel}_{variable}.png",
+                    "image/png",
+                    texto_preparar="🖼️ Preparar PNG en alta resolución (300 dpi)",
+                )
+
+                # --- Espectro global ---
+                st.markdown("### 📈 Espectro Global de Wavelet")
+                with metricas.etapa("transformacion", "espectro global"):
+                    coef = wavelet.coeficientes(estacion_sel, variable, wavelet_type, num_escala, signal, version)
+                fig_global = px.line(x=wavelet.espectro_global(coef), y=escalas, labels={"x": "Potencia media", "y": "Escala"},
+                                     color_discrete_sequence=["steelblue"], height=400)
+                if umbrales:
+                    fig_global.add_scatter(x=umbrales["global"], y=escalas, mode="lines", name="95 % ruido rojo",
+                                           line=dict(color="firebrick", dash="dash"))
+                fig_global.update_layout(template="plotly_white", title=f"Potencia promediada en el tiempo - {variable}")
+                mostrar_grafico(fig_global, use_container_width=True)
+
+                # --- Relación con ENSO ---
+                st.markdown("### 🌐 Espectro Cruzado y Coherencia con ENSO")
+                st.caption("Índice ENSO derivado de la fase de cada mes: Niño = +1, Neutro = 0, Niña = -1.")
+                with metricas.etapa("transformacion", "coherencia"):
+                    cruzado, coh = wavelet.relacion_enso(estacion_sel, variable, wavelet_type, num_escala, signal, indice, version)
+                col8, col9 = st.columns(2)
+                with col8:
+                    fig_cruzado = wavelet.figura_escalograma(
+                        cruzado, float(np.percentile(cruzado, 99)), df["Fecha"], colormap,
+                        f"|W| cruzado: {variable} × ENSO", etiqueta="|Wxy|"
+                    )
+                    mostrar_grafico(fig_cruzado, use_container_width=True)
+                with col9:
+                    contorno_coh = coh / umbrales["coherencia"][:, None] if umbrales else None
+                    fig_coh = wavelet.figura_escalograma(
+                        coh, 1.0, df["Fecha"], colormap, f"Coherencia: {variable} × ENSO",
+                        contorno=contorno_coh, etiqueta="R²", vmin=0.0
+                    )
+                    mostrar_grafico(fig_coh, use_container_width=True)
+
+                # --- Explicación ---
+                with st.expander("ℹ️ ¿Qué muestra este gráfico Wavelet?"):
+                    st.markdown("""
+                    - La **transformada wavelet continua** permite identificar patrones periódicos o multiescalares.
+                    - Las **escalas más bajas** detectan eventos de alta frecuencia (cambios rápidos).
+                    - Las **escalas más altas** detectan patrones a largo plazo (tendencias).
+                    - El color indica la **magnitud de la energía** en esa escala y momento.
+                    - Los **contornos negros** marcan las zonas significativas al 95 % frente a ruido rojo (AR(1)).
+                    - El **espectro global** promedia la potencia en el tiempo; las escalas por encima de la línea roja son significativas.
+                    - La **coherencia** (0 a 1) indica en qué escalas y momentos la variable y ENSO varían juntas.
+                    """)
+        except Exception as e:
+            st.error(f"❌ Error al procesar el análisis Wavelet: {e}")
@@ -0,0 +1,185 @@
+"""📊 Comparar Estaciones: métricas y gráficos de varias estaciones a la vez."""
+import numpy as np
+import plotly.express as px
+import streamlit as st
+
+import cubo
+import metricas
+from secciones.comun import (
+    boton_exportar,
+    celdas_cubo,
+    consultar_estaciones,
+    lista_estaciones,
+    mostrar_grafico,
+    sin_datos,
+)
+from secciones.graficos import filas_para_puntos, grafico_boxplot
+
+
+def mostrar():
+    st.markdown("# 📊 Comparación Interactiva entre Estaciones")
+    st.markdown("Selecciona una o más estaciones para comparar sus métricas climáticas de forma profesional e interactiva.")
+
+    estaciones = lista_estaciones()
+
+    with st.container():
+        st.markdown("""
+        <style>
+        .stMultiSelect>div>div>div {
+            background-color: #f7fbff;
+            border: 1px solid #dbeaff;
+            border-radius: 8px;
+            padding: 0.5rem;
+        }
+        .metric-card {
+            background: linear-gradient(to top, #e0f2f7, #f9fbfc);
+            padding: 1rem;
+            border-radius: 12px;
+            box-shadow: 0 3px 10px rgba(0,0,0,0.1);
+            text-align: center;
+            transition: transform 0.2s;
+        }
+        .metric-card:hover {
+            transform: scale(1.03);
+        }
+        .metric-card h5 {
+            margin-bottom: 0.3rem;
+            color: #1f4e79;
+            font-size: 15px;
+        }
+        .metric-card p {
+            font-size: 26px;
+            margin: 0;
+            font-weight: bold;
+            color: #073763;
+        }
+        .styled-table {
+            background-color: #ffffff;
+            border-radius: 10px;
+            border: 1px solid #dde9f3;
+        }
+        </style>
+        """, unsafe_allow_html=True)
+
+    estaciones_sel = st.multiselect("🎯 Escoge las estaciones a comparar:", estaciones, default=estaciones[:2])
+
+    if not estaciones_sel:
+        st.warning("⚠️ Debes seleccionar al menos una estación.")
+    else:
+        df_total = consultar_estaciones(estaciones_sel)
+
+        if not df_total.empty:
+            with st.expander("🎛️ Filtros globales para la comparación"):
+                col1, col2 = st.columns(2)
+                with col1:
+                    años = st.multiselect("Años", sorted(df_total["Año"].unique()), default=sorted(df_total["Año"].unique()))
+                with col2:
+                    meses = st.multiselect("Meses", df_total["Mes"].unique(), default=df_total["Mes"].unique())
+
+            df_total = df_total[(df_total["Año"].isin(años)) & (df_total["Mes"].isin(meses))]
+            celdas = celdas_cubo(estaciones_sel, {"Año": años, "Mes": meses})
+            
+            # Resumen por estación desde el cubo de agregados (una sola vez)
+            with metricas.etapa("transformacion", "resumen por estación"):
+                resumen = cubo.resumir(celdas, ["Estación"], {
+                    "SPI": ["median", "min", "max"],
+                    "Precipitación": ["mean", "median", "min", "max"]
+                }).round(2)
+
+            comparacion = st.selectbox("📌 Elige el tipo de comparación que deseas visualizar:", [
+                "📈 Tabla resumen de métricas",
+                "📦 Boxplots SPI y Precipitación",
+                "📉 Serie temporal SPI promedio",
+                "🌧️ Precipitación anual acumulada",
+                "🧭 Panel comparativo por estación",
+                "🔥 Mapa de calor de métricas por estación"
+            ])
+
+            if sin_datos(celdas):
+                # Sin años o sin meses elegidos: el menú se conserva, sin gráficos
+                pass
+            elif comparacion == "📈 Tabla resumen de métricas":
+                st.markdown("## 📋 Tabla Resumen Estadístico")
+                st.dataframe(resumen.style.set_properties(**{
+                    'background-color': '#f4faff',
+                    'color': '#002c4d',
+                    'border-color': '#dee6f0',
+                    'font-size': '16px',
+                    'font-weight': '500'
+                }), use_container_width=True)
+
+                # Interpretación automática
+                try:
+                    est_humeda = resumen.loc[resumen["Precipitación_mean"].idxmax(), "Estación"]
+                    est_spi_ext = resumen.loc[resumen["SPI_max"].idxmax(), "Estación"]
+                    est_spi_sec = resumen.loc[resumen["SPI_min"].idxmin(), "Estación"]
+                    st.success(f"📌 La estación con mayor precipitación promedio es **{est_humeda}**.\n\n📈 El SPI más alto fue registrado en **{est_spi_ext}** y el más bajo en **{est_spi_sec}**.")
+                except:
+                    st.info("No se pudo generar interpretación automática.")
+
+            elif comparacion == "📦 Boxplots SPI y Precipitación":
+                ver_puntos = st.checkbox("🔘 Mostrar observaciones individuales", key="cmp_puntos")
+                puntos = filas_para_puntos(df_total, ver_puntos)
+
+                st.subheader("📦 Boxplot de SPI por Estación")
+                fig_spi = grafico_boxplot(celdas, "Estación", "SPI", df=puntos)
+                mostrar_grafico(fig_spi, use_container_width=True)
+
+                st.subheader("📦 Boxplot de Precipitación por Estación")
+                fig_ppt = grafico_boxplot(celdas, "Estación", "Precipitación", df=puntos)
+                mostrar_grafico(fig_ppt, use_container_width=True)
+
+            elif comparacion == "📉 Serie temporal SPI promedio":
+                st.subheader("📉 SPI Promedio Anual por Estación")
+                df_linea = cubo.resumir(celdas, ["Año", "Estación"], {"SPI": ["mean"]}).rename(columns={"SPI_mean": "SPI"})
+                fig_linea = px.line(df_linea, x="Año", y="SPI", color="Estación", markers=True)
+                mostrar_grafico(fig_linea, use_container_width=True)
+
+            elif comparacion == "🌧️ Precipitación anual acumulada":
+                st.subheader("🌧️ Precipitación Total Anual por Estación")
+                df_bar = cubo.resumir(celdas, ["Año", "Estación"], {"Precipitación": ["sum"]})
+                df_bar = df_bar.rename(columns={"Precipitación_sum": "Precipitación"})
+                fig_bar = px.bar(df_bar, x="Año", y="Precipitación", color="Estación", barmode="group")
+                mostrar_grafico(fig_bar, use_container_width=True)
+
+            elif comparacion == "🧭 Panel comparativo por estación":
+                st.markdown("---")
+                st.markdown("## 🧭 Panel Comparativo Profesional")
+                colsets = st.columns(len(estaciones_sel))
+                panel = cubo.resumir(celdas, ["Estación"], {"SPI": ["median"], "Precipitación": ["sum"]}).set_index("Estación")
+                for i, est in enumerate(estaciones_sel):
+                    spi_median = panel["SPI_median"].get(est, np.nan)
+                    ppt_total = panel["Precipitación_sum"].get(est, 0.0)
+                    categoria = "🌵 Seca" if spi_median <= -1 else "🌤️ Normal" if spi_median < 1 else "🌧️ Húmeda"
+                    with colsets[i]:
+                        st.markdown(f"### {est}")
+                        st.markdown(f"<div class='metric-card'><h5>SPI Mediana</h5><p>{spi_median:.2f}</p></div>", unsafe_allow_html=True)
+                        st.markdown(f"<div class='metric-card'><h5>Clasificación</h5><p>{categoria}</p></div>", unsafe_allow_html=True)
+                        st.markdown(f"<div class='metric-card'><h5>Precipitación Total</h5><p>{ppt_total:,.0f} mm</p></div>", unsafe_allow_html=True)
+
+            elif comparacion == "🔥 Mapa de calor de métricas por estación":
+                st.subheader("🔥 Comparación Visual con Mapa de Calor")
+
+                resumen_heat = resumen.set_index("Estación").copy()
+
+                fig_heatmap = px.imshow(
+                    resumen_heat,
+                    text_auto=True,
+                    color_continuous_scale="YlGnBu",
+                    aspect="auto",
+                    labels=dict(color="Valor"),
+                    height=500
+                )
+
+                fig_heatmap.update_layout(
+                    template="plotly_white",
+                    title="🔍 Comparación Numérica de Métricas por Estación",
+                    xaxis_title="Métrica",
+                    yaxis_title="Estación",
+                    font=dict(size=14)
+                )
+
+                mostrar_grafico(fig_heatmap, use_container_width=True)
+
+                # Botón de descarga
+                boton_exportar(fig_heatmap, "heatmap_estaciones", "📥 Descargar mapa de calor como PNG")
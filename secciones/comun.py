@@ -0,0 +1,142 @@
+"""Piezas compartidas por las secciones: carga de datos cacheada y exportación.
+
+Solo depende de streamlit y de la capa de datos; los gráficos (plotly) viven en
+secciones.graficos para que las secciones que no los usan no paguen su import.
+"""
+import hashlib
+
+import streamlit as st
+
+import cubo
+import datos
+import exportar
+import filtros
+import metricas
+
+
+# --- Exportación PNG bajo demanda ---
+# Kaleido solo se ejecuta cuando el usuario pide la imagen, y en un pool de
+# procesos que lo mantiene caliente entre exportaciones. El PNG se cachea por la
+# huella del contenido de la figura, así que repetir la descarga es gratis.
+@st.cache_resource(show_spinner=False)
+def pool_render():
+    return exportar.PoolRender()
+
+
+@st.cache_data(show_spinner="🖼️ Generando imagen...", max_entries=64)
+def _renderizar_png(huella, _fig):
+    return pool_render().renderizar(_fig)
+
+
+def boton_diferido(clave, huella, generar, etiqueta, nombre_archivo, mime, texto_preparar="🖼️ Preparar imagen PNG"):
+    # Muestra primero un botón "Preparar"; el archivo se genera solo tras el clic
+    # y el botón de descarga se mantiene mientras no cambie la huella del contenido.
+    # Si la generación falla se avisa aquí mismo y el resto de la página sigue;
+    # la huella solo se recuerda tras un archivo generado.
+    if st.session_state.get(f"listo_{clave}") != huella:
+        if not st.button(texto_preparar, key=f"preparar_{clave}"):
+            return
+    try:
+        with metricas.etapa("exportacion", nombre_archivo) as medicion:
+            data = generar()
+    except Exception as e:
+        st.session_state.pop(f"listo_{clave}", None)
+        st.error(f"❌ No se pudo generar {nombre_archivo}: {e}")
+        return
+    st.session_state[f"listo_{clave}"] = huella
+    medicion["bytes"] = len(data)
+    st.download_button(
+        etiqueta,
+        data=data,
+        file_name=nombre_archivo,
+        mime=mime,
+        key=f"descargar_{clave}",
+    )
+
+
+def boton_exportar(fig, nombre="grafico", etiqueta="📥 Descargar imagen"):
+    huella = hashlib.sha1(fig.to_json().encode()).hexdigest()
+    boton_diferido(nombre, huella, lambda: _renderizar_png(huella, fig), etiqueta, f"{nombre}.png", "image/png")
+
+
+# --- Envío de figuras al navegador ---
+def mostrar_grafico(fig, **kwargs):
+    # st.plotly_chart medido como etapa "render"; el tamaño de la figura
+    # serializada solo se calcula con el panel de desarrollador o la exportación
+    with metricas.etapa("render", "plotly") as medicion:
+        st.plotly_chart(fig, **kwargs)
+    if metricas.detallado():
+        medicion["bytes"] = len(fig.to_json())
+
+
+# --- Carga de datos compartida entre sesiones ---
+# Cada workbook se lee una sola vez por proceso (desde el snapshot Feather si
+# está vigente, si no desde el Excel); la clave incluye los mtime de ambos,
+# de modo que si el archivo cambia en disco se vuelve a leer.
+@st.cache_data(show_spinner=False, max_entries=256)
+def _leer_excel(ruta, version):
+    return datos.leer_tabla(ruta)
+
+
+@metricas.medir("carga")
+def leer_excel(ruta):
+    return _leer_excel(ruta, datos.firma(ruta))
+
+
+# El almacén unificado se comparte sin copiar entre sesiones; las consultas
+# devuelven siempre un DataFrame nuevo, así que nadie lo modifica.
+@st.cache_resource(show_spinner=False, max_entries=2)
+def _cargar_almacen(version):
+    return datos.leer_almacen()
+
+
+@metricas.medir("carga")
+def cargar_almacen():
+    return _cargar_almacen(datos.firma_almacen())
+
+
+def lista_estaciones():
+    return datos.estaciones(cargar_almacen())
+
+
+@metricas.medir("carga")
+def consultar_estaciones(estaciones):
+    return datos.consultar(cargar_almacen(), estaciones)
+
+
+# Índice de filtros (máscaras de bits por año, mes y fase) de cada estación,
+# compartido entre sesiones junto con su memo de resultados.
+@st.cache_resource(show_spinner=False, max_entries=32)
+def _indice_filtros(estacion, version):
+    return filtros.IndiceFiltros(consultar_estaciones([estacion]))
+
+
+@metricas.medir("carga")
+def indice_filtros(estacion):
+    return _indice_filtros(estacion, datos.firma_almacen())
+
+
+# Cubo de agregados (n, suma, mín, máx y sketch de cuantiles por Estación ×
+# Fase × Año × Mes) con su índice de filtros; los KPIs y tablas salen de aquí.
+@st.cache_resource(show_spinner=False, max_entries=2)
+def _indice_cubo(version):
+    return filtros.IndiceFiltros(datos.leer_cubo(), columnas=("Estación", *filtros.COLUMNAS))
+
+
+@metricas.medir("carga")
+def celdas_cubo(estaciones, filtro=None):
+    return _indice_cubo(datos.firma_almacen()).filtrar(Estación=estaciones, **(filtro or {}))
+
+
+@metricas.medir("transformacion")
+def anual_por_fase(celdas):
+    tabla = cubo.resumir(celdas, ["Año", "Fase_ENSO"], {"Precipitación": ["sum"]})
+    return tabla.rename(columns={"Precipitación_sum": "Precipitación"})
+
+
+def sin_datos(tabla):
+    # Selección vacía (p. ej. sin años o sin meses): aviso en lugar del gráfico
+    if tabla.empty:
+        st.warning("⚠️ No hay datos para la selección.")
+        return True
+    return False
@@ -0,0 +1,190 @@
+"""📊 Correlaciones: matrices por estación, comparación y heatmap animado."""
+import plotly.express as px
+import streamlit as st
+
+import correlacion
+import datos
+import metricas
+from datos import ruta_archivo
+from secciones.comun import boton_exportar, leer_excel, lista_estaciones, mostrar_grafico
+
+
+# Estadísticos suficientes por año (n, sumas, productos cruzados) de cada
+# estación: las correlaciones por año, ventana o rango salen de combinarlos.
+@st.cache_data(show_spinner=False, max_entries=32)
+def _estadisticos_correlacion(ruta, version):
+    df = datos.leer_tabla(ruta)
+    variables = [col for col in df.select_dtypes(include="number").columns if col != "Año"]
+    return correlacion.estadisticos_anuales(df, variables)
+
+
+@metricas.medir("transformacion")
+def estadisticos_correlacion(estacion):
+    ruta = ruta_archivo(estacion, datos.ARCHIVO_CLIMA)
+    return _estadisticos_correlacion(ruta, datos.firma(ruta))
+
+
+# Figura con un frame por año; se construye una vez por (estación, variables, ventana)
+@st.cache_data(show_spinner=False, max_entries=64)
+def _figura_correlacion_animada(estacion, variables, ventana, version):
+    est = estadisticos_correlacion(estacion)
+    matrices = correlacion.ventana_movil(est, ventana, list(variables))
+    sufijo = "" if ventana == 1 else f" · ventana de {ventana} años"
+    return correlacion.figura_animada(matrices, f"🔗 Correlaciones - {estacion}{sufijo}")
+
+
+@metricas.medir("figura")
+def figura_correlacion_animada(estacion, variables, ventana):
+    ruta = ruta_archivo(estacion, datos.ARCHIVO_CLIMA)
+    return _figura_correlacion_animada(estacion, tuple(variables), ventana, datos.firma(ruta))
+
+
+def mostrar():
+    st.markdown("# 📊 Matriz de Correlación entre Variables Climáticas")
+    st.markdown("Explora las relaciones estadísticas entre precipitación, temperatura, humedad y SPI por estación o comparando dos.")
+
+    estaciones = lista_estaciones()
+    modo = st.radio(
+        "🔍 ¿Qué deseas hacer?",
+        [
+            "🔹 Ver una sola estación",
+            "🔸 Comparar dos estaciones",
+            "📽️ Heatmap Animado por Año"
+        ],
+        horizontal=True
+    )
+
+
+    if modo == "🔹 Ver una sola estación":
+        estacion_sel = st.selectbox("📍 Selecciona la estación", estaciones)
+
+        try:
+            df_corr = leer_excel(ruta_archivo(estacion_sel, "Heatmap de correlación.xlsx"))
+            df_numeric = df_corr.select_dtypes(include='number')
+            variables_disponibles = df_numeric.columns.tolist()
+
+            with st.expander("🎛️ Filtros de variables para correlación", expanded=False):
+                st.markdown("""
+                    <style>
+                    .stMultiSelect>div>div>div {
+                        background-color: #ffffff !important;
+                        border-radius: 6px;
+                        border: 1px solid #c7dbf4 !important;
+                        font-size: 15px !important;
+                    }
+                    </style>
+                """, unsafe_allow_html=True)
+
+                seleccion = st.multiselect(
+                    label="📌 Selecciona variables numéricas:",
+                    options=variables_disponibles,
+                    default=variables_disponibles,
+                    key="filtro_variables_corr"
+                )
+
+
+            if len(seleccion) < 2:
+                st.warning("⚠️ Selecciona al menos dos variables para mostrar la matriz.")
+            else:
+                with metricas.etapa("transformacion", "corr"):
+                    matriz = df_corr[seleccion].corr().round(2)
+
+                fig = px.imshow(
+                    matriz,
+                    text_auto=True,
+                    color_continuous_scale="RdBu_r",
+                    zmin=-1,
+                    zmax=1,
+                    aspect="auto",
+                    labels=dict(color="Correlación"),
+                    title=f"🔗 Correlación - {estacion_sel}"
+                )
+                fig.update_layout(template="plotly_white", height=500)
+                mostrar_grafico(fig, use_container_width=True, key=f"cor_{estacion_sel}")
+
+                # Descargar
+                boton_exportar(fig, f"correlacion_{estacion_sel}", "📥 Descargar como PNG")
+
+        except Exception as e:
+            st.error(f"❌ Error al cargar la correlación de {estacion_sel}: {e}")
+
+    elif modo == "🔸 Comparar dos estaciones":
+        col1, col2 = st.columns(2)
+        with col1:
+            est1 = st.selectbox("📌 Estación A", estaciones, key="select_a")
+        with col2:
+            est2 = st.selectbox("📌 Estación B", estaciones, key="select_b")
+
+        with st.expander("🎛️ Filtrar variables a comparar", expanded=False):
+            try:
+                df_tmp = leer_excel(ruta_archivo(est1, "Heatmap de correlación.xlsx"))
+                variables_numericas = df_tmp.select_dtypes(include='number').columns.tolist()
+                seleccion_vars = st.multiselect(
+                    "🔢 Selecciona las variables numéricas a comparar",
+                    options=variables_numericas,
+                    default=variables_numericas,
+                    key="vars_comparar"
+                )
+            except:
+                seleccion_vars = []
+                st.warning("⚠️ No se pudieron cargar las variables disponibles.")
+
+        try:
+            @metricas.medir("transformacion", "corr")
+            def cargar_corr(est):
+                df = leer_excel(ruta_archivo(est, "Heatmap de correlación.xlsx"))
+                df = df[seleccion_vars] if seleccion_vars else df.select_dtypes(include='number')
+                return df.corr().round(2)
+
+            corr1 = cargar_corr(est1)
+            corr2 = cargar_corr(est2)
+
+            col1, col2 = st.columns(2)
+            with col1:
+                st.markdown(f"### 🔷 {est1}")
+                fig1 = px.imshow(corr1, text_auto=True, color_continuous_scale="RdBu_r", zmin=-1, zmax=1)
+                fig1.update_layout(template="plotly_white", title="", height=400)
+                mostrar_grafico(fig1, use_container_width=True, key=f"plot_{est1}_1")
+
+            with col2:
+                st.markdown(f"### 🔶 {est2}")
+                fig2 = px.imshow(corr2, text_auto=True, color_continuous_scale="RdBu_r", zmin=-1, zmax=1)
+                fig2.update_layout(template="plotly_white", title="", height=400)
+                mostrar_grafico(fig2, use_container_width=True, key=f"plot_{est2}_2")
+
+        except Exception as e:
+            st.error(f"❌ Error al comparar estaciones: {e}")
+            
+
+    elif modo == "📽️ Heatmap Animado por Año":
+        st.markdown("## 📽️ Evolución Temporal de Correlaciones")
+        estacion_sel = st.selectbox("🎯 Selecciona la estación para animación", estaciones, key="est_anim")
+
+        try:
+            est = estadisticos_correlacion(estacion_sel)
+
+            # Variables numéricas
+            variables = est["variables"]
+            selected_vars = st.multiselect("📊 Variables a incluir", variables, default=variables)
+
+            years = [int(año) for año in est["años"]]
+
+            # Controles de animación: la reproducción corre en el navegador
+            col_b, col_c = st.columns([1, 2])
+            with col_b:
+                anim_speed = st.slider("⏱️ Segundos por año", 0.3, 2.0, value=1.0, step=0.1)
+            with col_c:
+                año_manual = st.selectbox("📅 Año inicial", years, key="año_manual")
+
+            ventana = st.slider("🪟 Años acumulados (ventana que termina en cada año)", 1, 10, value=1, key="ventana_corr")
+
+            if len(selected_vars) < 2:
+                st.warning("⚠️ Selecciona al menos dos variables para mostrar la matriz.")
+            else:
+                st.caption("▶️ Usa los botones bajo el gráfico para animar hacia adelante o hacia atrás, o arrastra el control de año.")
+                fig = figura_correlacion_animada(estacion_sel, selected_vars, ventana)
+                fig = correlacion.controles_animacion(fig, año_manual, anim_speed)
+                mostrar_grafico(fig, use_container_width=True)
+
+        except Exception as e:
+            st.error(f"❌ Error al generar el heatmap animado: {e}")
@@ -0,0 +1,183 @@
+"""Constructores de gráficos de estación (boxplots, series, barras y dispersión)."""
+import plotly.express as px
+import plotly.graph_objects as go
+import streamlit as st
+
+import cubo
+import datos
+import metricas
+import regresion
+import submuestreo
+from secciones.comun import anual_por_fase, boton_diferido, celdas_cubo, consultar_estaciones, pool_render
+
+
+COLORES_ENSO = {"Niño": "red", "Niña": "blue", "Neutro": "gray"}
+
+
+# Los boxplots se dibujan con los cinco números del cubo; las observaciones
+# individuales solo viajan al navegador si se piden y son pocas.
+UMBRAL_PUNTOS = 5000
+
+
+@metricas.medir("figura")
+def grafico_boxplot(celdas, x, y, colores=None, df=None):
+    # df: filas originales, solo cuando se quieren ver todos los puntos
+    if df is not None:
+        return px.box(df, x=x, y=y, color=x, points="all", color_discrete_map=colores or {})
+    fig = go.Figure()
+    for caja in cubo.resumen_caja(celdas, [x], y).to_dict("records"):
+        grupo = caja[x]
+        fig.add_trace(go.Box(
+            x=[grupo], name=str(grupo),
+            q1=[caja["q1"]], median=[caja["mediana"]], q3=[caja["q3"]],
+            lowerfence=[caja["bigote_inf"]], upperfence=[caja["bigote_sup"]],
+            marker_color=(colores or {}).get(grupo),
+        ))
+    fig.update_layout(xaxis_title=x, yaxis_title=y, legend_title_text=x)
+    return fig
+
+
+def grafico_boxplot_fase(celdas, y, df=None):
+    return grafico_boxplot(celdas, "Fase_ENSO", y, COLORES_ENSO, df)
+
+
+def filas_para_puntos(df, ver_puntos):
+    if not ver_puntos:
+        return None
+    if len(df) > UMBRAL_PUNTOS:
+        st.caption(f"ℹ️ {len(df):,} observaciones: se muestra solo el resumen (máximo {UMBRAL_PUNTOS:,} puntos).")
+        return None
+    return df
+
+
+# Las series con más de submuestreo.PUNTOS_MAX puntos se reducen con LTTB y
+# se dibujan como línea simple (sin marcadores ni spline).
+@metricas.medir("transformacion")
+def serie_reducida(df, y, por=None):
+    if len(df) <= submuestreo.PUNTOS_MAX:
+        return df, False
+    return submuestreo.reducir(df, "Fecha", y, por=por), True
+
+
+def rango_visible(df, key):
+    # Recorta una serie larga al rango elegido; al acercarse la reducción
+    # reparte los mismos puntos en menos tiempo y aparece más detalle
+    if len(df) <= submuestreo.PUNTOS_MAX:
+        return df
+    inicio, fin = df["Fecha"].min().to_pydatetime(), df["Fecha"].max().to_pydatetime()
+    desde, hasta = st.slider(
+        "🔍 Rango visible (acércate para ver más detalle)",
+        min_value=inicio, max_value=fin, value=(inicio, fin),
+        format="YYYY-MM-DD", key=f"{key}_rango",
+    )
+    return df[(df["Fecha"] >= desde) & (df["Fecha"] <= hasta)]
+
+
+# Por encima de UMBRAL_WEBGL filas los gráficos de puntos y líneas se dibujan
+# con WebGL (scattergl) en lugar de SVG; el estilo es el mismo.
+UMBRAL_WEBGL = 10000
+
+
+def modo_render(n):
+    return "webgl" if n > UMBRAL_WEBGL else "svg"
+
+
+def traza_scatter(n, **kwargs):
+    return go.Scattergl(**kwargs) if n > UMBRAL_WEBGL else go.Scatter(**kwargs)
+
+
+@metricas.medir("figura")
+def grafico_serie_spi(df_spi):
+    render = modo_render(len(df_spi))
+    df_spi, reducida = serie_reducida(df_spi, "SPI")
+    return px.line(
+        df_spi,
+        x="Fecha",
+        y="SPI",
+        render_mode=render,
+        markers=not reducida,
+        # scattergl no admite spline
+        line_shape="spline" if render == "svg" and not reducida else "linear",
+        color_discrete_sequence=["black"],
+    )
+
+
+@metricas.medir("figura")
+def grafico_serie_precipitacion(df):
+    render = modo_render(len(df))
+    df, reducida = serie_reducida(df, "Precipitación", por="Fase_ENSO")
+    return px.line(
+        df,
+        x="Fecha",
+        y="Precipitación",
+        color="Fase_ENSO",
+        render_mode=render,
+        # scattergl no admite spline
+        line_shape="spline" if render == "svg" and not reducida else "linear",
+        markers=not reducida,
+        color_discrete_map=COLORES_ENSO,
+    )
+
+
+@metricas.medir("figura")
+def grafico_barras_anuales(df_grouped):
+    # df_grouped: precipitación total por (Año, Fase_ENSO), ver anual_por_fase
+    return px.bar(
+        df_grouped,
+        x="Año",
+        y="Precipitación",
+        color="Fase_ENSO",
+        color_discrete_map=COLORES_ENSO,
+    )
+
+
+@metricas.medir("figura")
+def grafico_dispersion(df, ajustes=None):
+    # ajustes: rectas por fase ya calculadas (regresion.ajustar_grupos)
+    if ajustes is None:
+        ajustes = regresion.ajustar_grupos(df, "SPI", "Precipitación", por="Fase_ENSO")
+    fig = px.scatter(
+        df,
+        x="SPI",
+        y="Precipitación",
+        color="Fase_ENSO",
+        render_mode=modo_render(len(df)),
+        color_discrete_map=COLORES_ENSO,
+    )
+    fig.update_traces(marker=dict(size=10))
+    for ajuste in ajustes.dropna(subset=["pendiente"]).to_dict("records"):
+        fase = ajuste["Fase_ENSO"]
+        fig.add_trace(regresion.traza_tendencia(ajuste, fase, COLORES_ENSO.get(fase), "SPI", "Precipitación"))
+    return fig
+
+
+def graficos_estacion(df, celdas):
+    return {
+        "boxplot_precipitacion": grafico_boxplot_fase(celdas, "Precipitación"),
+        "boxplot_spi": grafico_boxplot_fase(celdas, "SPI"),
+        "serie_spi": grafico_serie_spi(df[["Fecha", "SPI"]]),
+        "serie_precipitacion": grafico_serie_precipitacion(df),
+        "barras_anuales": grafico_barras_anuales(anual_por_fase(celdas)),
+        "dispersión_spi_precipitacion": grafico_dispersion(df),
+    }
+
+
+# --- ZIP con todos los gráficos de una estación ---
+# Las figuras se rasterizan en el pool de kaleido: una tras otra con el proceso
+# por defecto, en paralelo con ENSO_PROCESOS_EXPORTACION > 1.
+@st.cache_data(show_spinner="🗜️ Generando ZIP...", max_entries=16)
+def _zip_estacion(estacion, version):
+    return pool_render().zip(graficos_estacion(consultar_estaciones([estacion]), celdas_cubo([estacion])))
+
+
+def boton_zip_estacion(estacion):
+    version = datos.firma_almacen()
+    boton_diferido(
+        "zip",
+        (estacion, version),
+        lambda: _zip_estacion(estacion, version),
+        "📦 Descargar ZIP",
+        f"graficos_{estacion}.zip",
+        "application/zip",
+        texto_preparar=f"🗜️ Preparar ZIP con todos los gráficos de {estacion}",
+    )
@@ -0,0 +1,51 @@
+"""📘 Introducción: presentación del proyecto."""
+import streamlit as st
+import streamlit.components.v1 as components
+
+
+def mostrar():
+    st.title("🌎 Proyecto: ENSO y Precipitación en el Chocó Andino")
+    
+    # HTML como cadena de texto
+    html_code = """
+    <div style="background-color: #f8f8f8; padding: 3rem; border-radius: 15px; box-shadow: 0px 10px 20px rgba(0, 0, 0, 0.1);">
+        <div style="text-align: center;">
+            <h2 style="color: #004d7a; font-size: 30px; font-weight: bold; margin-bottom: 20px;">El Fenómeno ENSO</h2>
+            <p style="font-size: 20px; color: #595959; line-height: 1.6; max-width: 800px; margin: 0 auto;">
+                El fenómeno <strong>ENSO</strong> es un evento climático interanual que altera significativamente las condiciones atmosféricas y oceánicas a nivel global. 
+                Este fenómeno se presenta en tres fases: <strong>El Niño</strong>, <strong>La Niña</strong> y una fase <strong>Neutra</strong>, 
+                cada una con impactos distintos sobre los sistemas naturales y humanos, especialmente en la distribución de las lluvias y temperaturas en regiones tropicales.
+            </p>
+        </div>
+
+        <div style="background-color: #ffffff; padding: 2rem; margin-top: 30px; border-radius: 10px; box-shadow: 0px 4px 10px rgba(0, 0, 0, 0.05);">
+            <h3 style="color: #004d7a; font-size: 24px; font-weight: bold;">🎯 Objetivo del Proyecto</h3>
+            <p style="font-size: 18px; color: #595959; line-height: 1.6;">
+                Este proyecto analiza la relación entre los eventos ENSO (El Niño, La Niña y Neutro) y la precipitación en el <strong>Chocó Andino</strong> entre los años 
+                <strong>1992 y 2022</strong>, utilizando herramientas estadísticas y de visualización avanzada.
+            </p>
+        </div>
+
+        <div style="background-color: #ffffff; padding: 2rem; margin-top: 30px; border-radius: 10px; box-shadow: 0px 4px 10px rgba(0, 0, 0, 0.05);">
+            <h3 style="color: #004d7a; font-size: 24px; font-weight: bold;">🔬 Metodología</h3>
+            <p style="font-size: 18px; color: #595959; line-height: 1.6;">
+                Se emplean análisis estadísticos rigurosos, visualizaciones interactivas y mapas dinámicos para evaluar el impacto de los eventos ENSO en las estaciones meteorológicas ubicadas en la región.
+            </p>
+        </div>
+
+        <div style="background-color: #ffffff; padding: 2rem; margin-top: 30px; border-radius: 10px; box-shadow: 0px 4px 10px rgba(0, 0, 0, 0.05); display: flex; justify-content: space-between; align-items: center;">
+            <div style="flex: 1; padding-right: 20px;">
+                <h3 style="color: #004d7a; font-size: 24px; font-weight: bold;">👥 Integrantes</h3>
+                <p style="font-size: 18px; color: #595959; line-height: 1.6;">
+                    <span style="font-weight: bold; color: #1f4e79;">💼 Lizeth Aguilar</span> <br>
+                    <span style="font-weight: bold; color: #1f4e79;">🎓 Jessica Quinga</span> <br>
+                    <span style="font-weight: bold; color: #1f4e79;">🔬 Deysi Remache</span> 
+                </p>
+            </div>
+         </div>
+    """
+    
+    # Usamos st.components.v1.html para procesar el HTML
+    components.html(html_code, height=1200)
+
+    st.success("Usa el panel lateral para navegar entre las secciones del proyecto.")
@@ -0,0 +1,209 @@
+"""🗺️ Mapa Interactivo: estaciones sobre el contorno del Chocó Andino, por año."""
+import io
+
+import pydeck as pdk
+import streamlit as st
+
+import datos
+import mapa
+import metricas
+from datos import ruta_archivo
+from secciones.comun import leer_excel, lista_estaciones
+
+
+# Los niveles simplificados del contorno se generan (si faltan) una vez por proceso
+@st.cache_resource(show_spinner=False)
+def contorno_url(zoom):
+    return mapa.url_contorno(zoom)
+
+
+# Colores, criticidad e íconos de cada estación para todos los años del mapa
+@st.cache_data(show_spinner=False, max_entries=8)
+def _atributos_mapa(variable, rutas, version):
+    return mapa.atributos_por_año({nombre: datos.leer_tabla(ruta) for nombre, ruta in rutas}, variable)
+
+
+@metricas.medir("transformacion")
+def atributos_mapa(variable, rutas):
+    return _atributos_mapa(variable, rutas, tuple(datos.firma(ruta) for _, ruta in rutas))
+
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def leyenda_mapa(etiqueta, min_val, max_val):
+    import matplotlib.pyplot as plt
+    import matplotlib.colors as mcolors
+
+    fig, ax = plt.subplots(figsize=(3.5, 0.3))
+    fig.subplots_adjust(left=0.1, right=0.9, top=0.8, bottom=0.3)
+    cbar = plt.colorbar(
+        plt.cm.ScalarMappable(norm=mcolors.Normalize(vmin=min_val, vmax=max_val), cmap=plt.get_cmap("RdYlBu")),
+        cax=ax,
+        orientation='horizontal'
+    )
+    cbar.set_label(f"{etiqueta} ({round(min_val, 2)} - {round(max_val, 2)})", fontsize=8)
+    cbar.ax.tick_params(labelsize=6)
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format="png", dpi=200, bbox_inches="tight")
+    plt.close(fig)
+    return buffer.getvalue()
+
+
+def mostrar():
+    st.title("📍 Estaciones Meteorológicas en el Chocó Andino")
+
+    # === Coordenadas ===
+    estaciones_coords = {
+        "Estación 1": {"coord": (-78.4869, 1.1538)},
+        "Estación 2": {"coord": (-78.8486, 1.1657)},
+        "Estación 3": {"coord": (-78.9639, 0.7483)},
+        "Estación 4": {"coord": (-79.8566, 0.5698)},
+        "Estación 5": {"coord": (-79.1721, 0.3316)},
+        "Estación 6": {"coord": (-79.2675, 0.1138)},
+    }
+
+    # === Selección de variable ===
+    variable_opciones = {
+        "Precipitación": "Precipitacion (mm)",
+        "SPI": "SPI",
+        "Temperatura": "Temperatura (Â°C)",
+        "Humedad": "Humedad (%)"
+    }
+    variable_amigable = st.selectbox("Selecciona la variable:", list(variable_opciones.keys()))
+    variable = variable_opciones[variable_amigable]
+
+    # === Cargar datos desde Excel ===
+    datos_estaciones = {}
+    rutas_resumen = {}
+    for estacion in lista_estaciones():
+        # Solo se dibujan las estaciones del almacén con coordenadas conocidas
+        nombre = estacion.replace("Estacion", "Estación")
+        if nombre not in estaciones_coords:
+            continue
+        try:
+            rutas_resumen[nombre] = ruta_archivo(estacion, "Resumen_Anual.xlsx")
+            df = leer_excel(rutas_resumen[nombre])
+            datos_estaciones[nombre] = df
+        except:
+            rutas_resumen.pop(nombre, None)
+            continue
+
+    # === Atributos por año (colores, criticidad, íconos) precalculados ===
+    atributos = atributos_mapa(variable, tuple(rutas_resumen.items()))
+
+    if not atributos["estaciones"]:
+        st.warning(f"No se encontraron datos para la variable '{variable_amigable}' en los archivos cargados.")
+        st.stop()
+
+    min_val, max_val = atributos["vmin"], atributos["vmax"]
+    coords = {nombre: info["coord"] for nombre, info in estaciones_coords.items()}
+
+    # === Capa: polígono (Chocó Andino) ===
+    # Contorno simplificado servido como archivo estático: el Deck solo lleva
+    # la URL y el navegador lo descarga una vez por sesión
+    zoom_inicial = mapa.ZOOM_INICIAL
+    polygon_layer = pdk.Layer(
+        "GeoJsonLayer",
+        contorno_url(zoom_inicial),
+        id="contorno",
+        stroked=True,
+        filled=True,
+        extruded=False,
+        get_fill_color="[102, 189, 99, 50]",  # verde claro con transparencia
+        get_line_color=[26, 152, 80],
+        get_line_width=2,
+        pickable=False,
+    )
+
+    # === Vista 3D ===
+    view_state = pdk.ViewState(
+        latitude=0.6,
+        longitude=-79,
+        zoom=zoom_inicial,
+        pitch=50,
+        bearing=0
+    )
+
+    animar = st.checkbox("▶️ Recorrer los años automáticamente", key="animar_mapa")
+    st.session_state.setdefault("año_mapa", 1992)
+
+    # Solo este fragmento se vuelve a ejecutar al mover el año (o en cada paso
+    # de la animación): cambia los registros de las estaciones, nada más
+    def vista_año():
+        if animar:
+            st.session_state["año_mapa"] = 1992 if st.session_state["año_mapa"] >= 2022 else st.session_state["año_mapa"] + 1
+
+        año_seleccionado = st.slider(
+            "Selecciona el año:",
+            min_value=1992,
+            max_value=2022,
+            step=1,
+            format="%d",
+            key="año_mapa",
+        )
+        stations_data = mapa.registros(atributos, año_seleccionado, coords)
+
+        # === Capa: estaciones (círculo grande) ===
+        station_layer = pdk.Layer(
+            "ScatterplotLayer",
+            stations_data,
+            id="estaciones",
+            get_position=["longitude", "latitude"],
+            get_elevation="elevation",
+            get_fill_color="color",
+            get_radius=2500,
+            radius_min_pixels=4,
+            pickable=True,
+        )
+
+        # === Capa: ícono de estación meteorológica ===
+        # Un solo sprite local con los tres íconos (ver mapa.MAPEO_ICONOS); como
+        # String, pydeck envía la URL en vez de incrustar la imagen en base64.
+        # Con un id fijo deck.gl reutiliza la textura entre años.
+        icon_layer = pdk.Layer(
+            "IconLayer",
+            stations_data,
+            id="iconos",
+            icon_atlas=pdk.types.String(mapa.url_atlas(), quote_type=""),
+            icon_mapping=mapa.MAPEO_ICONOS,
+            get_icon="icon_data",
+            get_position=["longitude", "latitude"],
+            get_size=8,           # Aumentado
+            size_scale=10,
+            pickable=True
+        )
+
+        # === Renderizar todas las capas ===
+        r = pdk.Deck(
+            layers=[polygon_layer, station_layer, icon_layer],
+            initial_view_state=view_state,
+            map_style="light",
+            tooltip={
+                "html": "<b>{name}</b><br>Valor: {value}<br>Año: {año}<br>Criticidad: #{rango}",
+                "style": {"backgroundColor": "rgba(0, 0, 0, 0.7)", "color": "white"}
+            }
+        )
+
+        # Mostrar el mapa 3D
+        with metricas.etapa("render", "pydeck") as medicion:
+            st.pydeck_chart(r, key="mapa_estaciones")
+        if metricas.detallado():
+            medicion["bytes"] = len(r.to_json())
+
+        # === Crear columnas para leyenda y tabla ===
+        col1, col2 = st.columns([1, 1])
+
+        # === Columna izquierda: leyenda de colores ===
+        with col1:
+            st.markdown("#### 🎨 Leyenda")
+            st.image(leyenda_mapa(variable_amigable, min_val, max_val))
+
+        # === Columna derecha: tabla de estación seleccionada ===
+        with col2:
+            estacion_seleccionada = st.selectbox("Selecciona una estación para ver sus datos:", list(datos_estaciones.keys()))
+            df = datos_estaciones[estacion_seleccionada]
+            df_año = df[df["Año"] == año_seleccionado]
+
+            st.markdown(f"### 📊 Detalles de {estacion_seleccionada} - {año_seleccionado}")
+            st.dataframe(df_año)
+
+    st.fragment(vista_año, run_every=1.5 if animar else None)()
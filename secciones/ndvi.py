@@ -0,0 +1,203 @@
+"""🌿 NDVI: KPIs, tendencia, anomalías y comparación de periodos."""
+import plotly.express as px
+import streamlit as st
+
+import datos
+import metricas
+import regresion
+from secciones.comun import leer_excel, mostrar_grafico
+
+
+RUTA_NDVI = "data/NDVI/NDVI anual.xlsx"
+
+
+# Recta de tendencia memoizada por los filtros de periodo y umbral
+@st.cache_data(show_spinner=False, max_entries=64)
+def _ajuste_ndvi(rango, umbral, version):
+    df = datos.leer_tabla(RUTA_NDVI)[["Año", "NDVI Anual"]].dropna()
+    df = df[df["Año"].between(*rango) & df["NDVI Anual"].between(*umbral)]
+    return regresion.ajustar(df["Año"], df["NDVI Anual"])
+
+
+@metricas.medir("transformacion")
+def ajuste_ndvi(rango, umbral):
+    return _ajuste_ndvi(tuple(rango), tuple(umbral), datos.firma(RUTA_NDVI))
+
+
+def mostrar():
+    st.title("🌿 Análisis Dinámico del NDVI Promedio Anual (1992–2022)")
+
+    # --- Estilo personalizado ---
+    st.markdown("""
+        <style>
+        .main { background-color: #f5faff; }
+        h1, h2, h3, h4 { color: #003366; }
+        .stMetric { font-size: 18px !important; }
+        </style>
+    """, unsafe_allow_html=True)
+
+    # --- Cargar datos ---
+    df_ndvi = leer_excel(RUTA_NDVI)
+    df_ndvi = df_ndvi[["Año", "NDVI Anual"]].dropna()
+
+    # --- Tabs ---
+    tab1, tab2, tab3, tab4, tab5 = st.tabs([
+        "📊 KPIs", "📈 Evolución NDVI", "🚨 Anomalías",
+        "🔢 Comparación de Periodos", "🧐 Conclusiones"
+    ])
+
+    # TAB 1: KPIs
+    with tab1:
+        st.subheader("📊 Indicadores Clave")
+        rango = st.slider("Selecciona el periodo de análisis:", int(df_ndvi["Año"].min()), int(df_ndvi["Año"].max()), value=(1992, 2022))
+        df_filtrado = df_ndvi[(df_ndvi["Año"] >= rango[0]) & (df_ndvi["Año"] <= rango[1])]
+
+        # Filtro de NDVI por umbral
+        ndvi_min, ndvi_max = st.slider("Filtrar NDVI entre:", 0.0, 1.0, (0.2, 0.8))
+        df_filtrado = df_filtrado[(df_filtrado["NDVI Anual"] >= ndvi_min) & (df_filtrado["NDVI Anual"] <= ndvi_max)]
+
+        promedio = df_filtrado["NDVI Anual"].mean()
+        minimo = df_filtrado["NDVI Anual"].min()
+        maximo = df_filtrado["NDVI Anual"].max()
+        std = df_filtrado["NDVI Anual"].std()
+        tendencia = "⬆️ Ascendente" if df_filtrado["NDVI Anual"].iloc[-1] > df_filtrado["NDVI Anual"].iloc[0] else "⬇️ Descendente"
+
+        col1, col2, col3, col4, col5 = st.columns(5)
+        col1.metric("Promedio", f"{promedio:.3f}")
+        col2.metric("Mínimo", f"{minimo:.3f}")
+        col3.metric("Máximo", f"{maximo:.3f}")
+        col4.metric("Desviación", f"{std:.3f}")
+        col5.metric("Tendencia", tendencia)
+
+        csv = df_filtrado.to_csv(index=False).encode("utf-8")
+        st.download_button("⬇️ Descargar datos como CSV", csv, "ndvi_filtrado.csv", "text/csv")
+
+    # TAB 2: Evolución NDVI
+    with tab2:
+        st.subheader("📈 Evolución del NDVI con Análisis de Tendencia")
+
+        # Ajuste lineal
+        ajuste = ajuste_ndvi(rango, (ndvi_min, ndvi_max))
+        fig_line = px.scatter(df_filtrado, x="Año", y="NDVI Anual",
+                              title="NDVI Promedio Anual con Ajuste Lineal",
+                              labels={"NDVI Anual": "NDVI"}, color_discrete_sequence=["#2e8b57"])
+        fig_line.update_traces(marker=dict(size=8))
+        if ajuste["n"] >= 2:
+            fig_line.add_trace(regresion.traza_tendencia(ajuste, "Tendencia", "#2e8b57", "Año", "NDVI"))
+            st.caption(f"📐 Pendiente: {ajuste['pendiente']:+.4f} NDVI/año · Intercepto: {ajuste['intercepto']:.3f} · R² = {ajuste['r2']:.3f}")
+        mostrar_grafico(fig_line, use_container_width=True)
+
+        # Histograma
+        if st.toggle("Mostrar histograma de NDVI"):
+            fig_hist = px.histogram(df_filtrado, x="NDVI Anual", nbins=10,
+                                    title="Distribución de NDVI", color_discrete_sequence=["#4682b4"])
+            mostrar_grafico(fig_hist, use_container_width=True)
+
+        # 📊 Animación impactante del NDVI anual
+                # 📽️ Animación personalizada del NDVI anual
+        # 📽️ Animación estilizada del NDVI anual (versión final)
+        st.markdown("### 🎞️ Animación Visual del NDVI Promedio Anual")
+        st.markdown(
+            "Explora visualmente la evolución del NDVI año por año con una presentación clara, estilizada y profesional."
+        )
+
+        # Preparar datos
+        df_anim = df_filtrado.copy()
+        df_anim["NDVI Etiqueta"] = df_anim["NDVI Anual"].apply(lambda x: f"{x:.3f}")
+
+        # Crear animación de una sola barra por año
+        fig_anim = px.bar(
+            df_anim,
+            x=["NDVI"] * len(df_anim),
+            y="NDVI Anual",
+            animation_frame="Año",
+            text="NDVI Etiqueta",
+            range_y=[0, 1],
+            color="NDVI Anual",
+            color_continuous_scale="Viridis",
+            title="🌿 Evolución Anual del NDVI",
+            labels={"NDVI Anual": "NDVI"}
+        )
+
+        # Estilo profesional
+        fig_anim.update_layout(
+            height=500,
+            margin=dict(t=60, b=30, l=40, r=40),
+            plot_bgcolor="#f4faff",
+            paper_bgcolor="#f4faff",
+            font=dict(family="Segoe UI", size=16, color="#003366"),
+            xaxis=dict(showticklabels=False),
+            coloraxis_showscale=False,
+            showlegend=False,
+            transition={"duration": 500, "easing": "linear"}
+        )
+
+        # Estética de las barras
+        fig_anim.update_traces(
+            textposition="outside",
+            marker_line_color="#003366",
+            marker_line_width=2
+        )
+
+        # Mostrar animación
+        mostrar_grafico(fig_anim, use_container_width=True)
+
+
+
+
+    # TAB 3: Anomalías
+    with tab3:
+        st.subheader("🚨 Detección Automática de Anomalías")
+        media = promedio
+        df_filtrado["Anómalo"] = df_filtrado["NDVI Anual"].apply(
+            lambda x: "🔴 Muy bajo" if x < media - std else ("🟢 Muy alto" if x > media + std else "⚪ Normal")
+        )
+        st.dataframe(df_filtrado[["Año", "NDVI Anual", "Anómalo"]], use_container_width=True)
+
+        fig_ano = px.line(df_filtrado, x="Año", y="NDVI Anual", markers=True,
+                          title="Análisis Temporal del NDVI con Anotaciones")
+        for _, row in df_filtrado.iterrows():
+            if row["Anómalo"] != "⚪ Normal":
+                fig_ano.add_annotation(x=row["Año"], y=row["NDVI Anual"], text=row["Anómalo"],
+                                       showarrow=True, arrowhead=1, ax=0, ay=-30, bgcolor="#f9f9f9")
+        mostrar_grafico(fig_ano, use_container_width=True)
+
+    # TAB 4: Comparación de Periodos
+    with tab4:
+        st.subheader("Comparador Interactivo de Periodos")
+        col1, col2 = st.columns(2)
+        with col1:
+            p1 = st.slider("Periodo 1", min_value=rango[0], max_value=rango[1], value=(1992, 2005))
+        with col2:
+            p2 = st.slider("Periodo 2", min_value=rango[0], max_value=rango[1], value=(2006, 2022))
+
+        df_p1 = df_ndvi[(df_ndvi["Año"] >= p1[0]) & (df_ndvi["Año"] <= p1[1])]
+        df_p2 = df_ndvi[(df_ndvi["Año"] >= p2[0]) & (df_ndvi["Año"] <= p2[1])]
+
+        c1, c2 = st.columns(2)
+        c1.metric("Promedio P1", f"{df_p1['NDVI Anual'].mean():.3f}")
+        c2.metric("Promedio P2", f"{df_p2['NDVI Anual'].mean():.3f}")
+
+        col3, col4 = st.columns(2)
+        with col3:
+            mostrar_grafico(px.line(df_p1, x="Año", y="NDVI Anual", title="NDVI - Periodo 1"), use_container_width=True)
+        with col4:
+            mostrar_grafico(px.line(df_p2, x="Año", y="NDVI Anual", title="NDVI - Periodo 2"), use_container_width=True)
+
+    # TAB 5: Conclusiones
+    with tab5:
+        st.subheader("🧐 Conclusión Automatizada del Análisis")
+
+        if promedio < 0.4:
+            st.warning("El NDVI promedio es bajo. Posible degradación o pérdida de vegetación.")
+        elif promedio > 0.6:
+            st.success("El NDVI promedio es alto. Vegetación saludable en el periodo analizado.")
+        else:
+            st.info("NDVI en nivel moderado. Sin cambios extremos, pero debe mantenerse vigilancia.")
+
+        st.markdown("#### 🔹 Recomendaciones:")
+        st.markdown("- Monitoreo continuo anual con datos satelitales actualizados.")
+        st.markdown("- Complementar con variables climáticas (SPI, temperatura, humedad).")
+        st.markdown("- Realizar análisis espacial si se cuenta con datos raster por zonas.")
+
+        comentario = st.text_area("💬 Anotaciones del analista (opcional):", placeholder="Escribe tus observaciones...")
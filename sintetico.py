@@ -0,0 +1,215 @@
+"""Estaciones sintéticas con los mismos workbooks que data/Estacion N, a cualquier escala.
+
+Uso: python sintetico.py --estaciones 60 [--años 31] [--resolucion mensual|diaria]
+                         [--destino data_sintetico] [--semilla 0] [--sin-snapshot] [--forzar]
+
+Cada estación recibe los tres workbooks que lee la app, con sus columnas exactas:
+
+- Boxplot precipitacion y spi.xlsx: Año, Mes, Precipitacion (mm), SPI, FECHA y
+  Fase_ENSO, una fila por mes o por día según la resolución.
+- Heatmap de correlación.xlsx: Año, Mes, Precipitacion (mm), Temperatura (°C),
+  Humedad (%) y SPI, siempre mensual (la app lo une al anterior por año y mes).
+- Resumen_Anual.xlsx: Año, Precipitacion (mm), Temperatura (Â°C), Humedad (%) y
+  SPI, con la misma cabecera mal codificada que los originales.
+
+Las fases ENSO salen de un índice tipo ONI común a todas las estaciones: Niño o
+Niña cuando su media móvil de 3 meses pasa de ±0.5 durante al menos 5 meses
+seguidos. La lluvia tiene dos estaciones lluviosas (abril y octubre), más lluvia
+en Niña y menos en Niño; el SPI se estandariza por mes del calendario.
+
+El destino debe estar vacío: con --forzar se borran antes sus carpetas
+"Estacion *" y snapshot/, para que no queden estaciones de una generación
+anterior mezcladas con las nuevas. Al terminar se compila el snapshot (Feather, almacén y cubo) con datos.py. La
+app usa estos datos con ENSO_DATOS=<destino>; el NDVI y el contorno del mapa
+siguen saliendo de data/.
+"""
+import argparse
+import glob
+import os
+import shutil
+import subprocess
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from statistics import NormalDist
+
+import numpy as np
+import pandas as pd
+
+from datos import ARCHIVO_CLIMA, ARCHIVO_ESTACION, MESES_ES
+
+
+ARCHIVO_RESUMEN = "Resumen_Anual.xlsx"
+AÑO_INICIAL = 1992
+
+# Factor sobre la lluvia y anomalía de temperatura (°C) de cada fase
+EFECTO_ENSO = {"Niño": (0.9, 0.4), "Neutro": (1.0, 0.0), "Niña": (1.12, -0.3)}
+
+
+# --- ENSO común ---
+def indice_oni(meses, rng):
+    # Dos oscilaciones de 2 a 7 años más ruido AR(1), suavizadas a 3 meses
+    t = np.arange(meses)
+    senal = sum(
+        amplitud * np.sin(2 * np.pi * t / (12 * rng.uniform(2, 7)) + rng.uniform(0, 2 * np.pi))
+        for amplitud in (0.8, 0.5)
+    )
+    ruido = np.zeros(meses)
+    for i in range(1, meses):
+        ruido[i] = 0.8 * ruido[i - 1] + rng.normal(0, 0.2)
+    return pd.Series(senal + ruido).rolling(3, center=True, min_periods=1).mean().to_numpy()
+
+
+def fases_enso(oni, umbral=0.5, duracion=5):
+    fases = np.full(len(oni), "Neutro", dtype=object)
+    for signo, fase in ((1, "Niño"), (-1, "Niña")):
+        activo = signo * oni >= umbral
+        # Tramos consecutivos por encima del umbral; solo cuentan los largos
+        bordes = np.flatnonzero(np.diff(np.r_[0, activo.astype(int), 0]))
+        for inicio, fin in zip(bordes[::2], bordes[1::2]):
+            if fin - inicio >= duracion:
+                fases[inicio:fin] = fase
+    return fases
+
+
+# --- Una estación ---
+def spi_empirico(valores, mes):
+    # Posición de Gringorten dentro de cada mes del calendario -> cuantil normal
+    normal = NormalDist()
+    spi = np.empty(len(valores))
+    for m in np.unique(mes):
+        idx = np.flatnonzero(mes == m)
+        rangos = pd.Series(valores[idx]).rank(method="average").to_numpy()
+        spi[idx] = [normal.inv_cdf(p) for p in (rangos - 0.44) / (len(idx) + 0.12)]
+    return spi
+
+
+def estacion(numero, años, resolucion, fases, semilla):
+    rng = np.random.default_rng([semilla, numero])
+    mensual = pd.date_range(f"{AÑO_INICIAL}-01-01", periods=años * 12, freq="MS")
+    mes = mensual.month.to_numpy()
+
+    # Lluvia mensual esperada: media de la estación, dos picos al año y efecto ENSO
+    media = rng.uniform(200, 450)
+    estacionalidad = 1 + 0.35 * np.cos(2 * np.pi * (mes - 4) / 6)
+    factor, anomalia_t = (np.array([EFECTO_ENSO[f][i] for f in fases]) for i in (0, 1))
+    esperada = media * estacionalidad * factor
+    if resolucion == "diaria":
+        fechas = pd.date_range(mensual[0], mensual[-1] + pd.offsets.MonthEnd(1), freq="D")
+        i_mes = ((fechas.year - AÑO_INICIAL) * 12 + fechas.month - 1).to_numpy()
+        # Días secos y chaparrones: gamma con forma < 1 sobre los días con lluvia
+        lluvia = rng.random(len(fechas)) < 0.6
+        diaria = np.where(lluvia, rng.gamma(0.8, 1.0, len(fechas)), 0.0)
+        diaria *= esperada[i_mes] / (0.6 * 0.8 * fechas.days_in_month.to_numpy())
+        precip = diaria
+        # Lluvia de 30 días; al principio de la serie se escala la ventana incompleta
+        acumulada = pd.Series(diaria).rolling(30, min_periods=1).mean().to_numpy() * 30
+        spi = spi_empirico(acumulada, fechas.month.to_numpy())
+        fase_fila = fases[i_mes]
+        fecha_txt = fechas.strftime("%Y-%m-%d")
+        mensual_precip = pd.Series(diaria).groupby(i_mes).sum().to_numpy()
+    else:
+        fechas = mensual
+        precip = rng.gamma(4.0, esperada / 4.0)
+        spi = spi_empirico(precip, mes)
+        fase_fila = fases
+        fecha_txt = fechas.strftime("%Y-%m")
+        mensual_precip = precip
+    spi_mensual = spi_empirico(mensual_precip, mes)
+
+    # Temperatura según la altura, con un poco de estacionalidad y ENSO; humedad
+    # más alta con lluvia y más baja con calor
+    altura = rng.uniform(500, 2500)
+    ruido_t = np.zeros(len(mes))
+    for i in range(1, len(mes)):
+        ruido_t[i] = 0.6 * ruido_t[i - 1] + rng.normal(0, 0.25)
+    anomalia = 0.6 * np.cos(2 * np.pi * (mes - 3) / 12) + anomalia_t + ruido_t
+    temperatura = 26 - 0.0055 * altura + anomalia
+    humedad = np.clip(88 + 1.5 * spi_mensual - 1.0 * anomalia + rng.normal(0, 1.2, len(mes)), 60, 100)
+
+    año = fechas.year.to_numpy()
+    principal = pd.DataFrame({
+        "Año": año,
+        "Mes": [MESES_ES[m - 1] for m in fechas.month],
+        "Precipitacion (mm)": precip,
+        "SPI": spi,
+        "FECHA": fecha_txt,
+        "Fase_ENSO": fase_fila,
+    })
+    clima = pd.DataFrame({
+        "Año": mensual.year.to_numpy(),
+        "Mes": [MESES_ES[m - 1] for m in mes],
+        "Precipitacion (mm)": mensual_precip,
+        "Temperatura (°C)": temperatura,
+        "Humedad (%)": humedad,
+        "SPI": spi_mensual,
+    })
+    resumen = clima.drop(columns="Mes").groupby("Año", as_index=False).mean()
+    resumen = resumen.rename(columns={"Temperatura (°C)": "Temperatura (Â°C)"})
+    resumen = resumen[["Año", "Precipitacion (mm)", "Temperatura (Â°C)", "Humedad (%)", "SPI"]]
+    return {ARCHIVO_ESTACION: principal, ARCHIVO_CLIMA: clima, ARCHIVO_RESUMEN: resumen}
+
+
+def escribir_estacion(destino, numero, años, resolucion, fases, semilla):
+    carpeta = os.path.join(destino, f"Estacion {numero}")
+    os.makedirs(carpeta, exist_ok=True)
+    for archivo, df in estacion(numero, años, resolucion, fases, semilla).items():
+        df.to_excel(os.path.join(carpeta, archivo), index=False)
+    return carpeta
+
+
+# --- Conjunto completo ---
+def limpiar(destino, forzar=False):
+    if not os.path.isdir(destino) or not os.listdir(destino):
+        return
+    if not forzar:
+        raise FileExistsError(f"{destino} no está vacío (usa --forzar para regenerarlo)")
+    for carpeta in glob.glob(os.path.join(destino, "Estacion *")) + [os.path.join(destino, "snapshot")]:
+        if os.path.isdir(carpeta):
+            shutil.rmtree(carpeta)
+
+
+def generar(destino, estaciones, años=31, resolucion="mensual", semilla=0, procesos=None, forzar=False):
+    limpiar(destino, forzar)
+    fases = fases_enso(indice_oni(años * 12, np.random.default_rng(semilla)))
+    os.makedirs(destino, exist_ok=True)
+    # Cada estación usa su propia semilla: el resultado no depende del orden
+    with ProcessPoolExecutor(max_workers=procesos) as pool:
+        futuros = [
+            pool.submit(escribir_estacion, destino, n, años, resolucion, fases, semilla)
+            for n in range(1, estaciones + 1)
+        ]
+        return [futuro.result() for futuro in futuros]
+
+
+def compilar(destino, silencioso=False):
+    # El snapshot lo compila la misma ingesta de la app, apuntada al destino
+    entorno = {**os.environ, "ENSO_DATOS": os.path.abspath(destino)}
+    raiz = os.path.dirname(os.path.abspath(__file__))
+    subprocess.run(
+        [sys.executable, os.path.join(raiz, "datos.py")], cwd=raiz, env=entorno, check=True,
+        stdout=subprocess.DEVNULL if silencioso else None,
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--estaciones", type=int, required=True)
+    parser.add_argument("--años", type=int, default=31)
+    parser.add_argument("--resolucion", choices=["mensual", "diaria"], default="mensual")
+    parser.add_argument("--destino", default="data_sintetico")
+    parser.add_argument("--semilla", type=int, default=0)
+    parser.add_argument("--procesos", type=int)
+    parser.add_argument("--sin-snapshot", action="store_true")
+    parser.add_argument("--forzar", action="store_true", help="borra antes las estaciones y el snapshot del destino")
+    args = parser.parse_args()
+
+    try:
+        carpetas = generar(
+            args.destino, args.estaciones, args.años, args.resolucion, args.semilla, args.procesos, args.forzar
+        )
+    except FileExistsError as e:
+        parser.error(str(e))
+    print(f"✔ {len(carpetas)} estaciones × {args.años} años ({args.resolucion}) en {args.destino}")
+    if not args.sin_snapshot:
+        compilar(args.destino)
+    print(f"Para usarlas: ENSO_DATOS={args.destino} streamlit run app.py")
@@ -0,0 +1,69 @@
+"""Reducción de series temporales largas antes de enviarlas al navegador.
+
+LTTB (Largest-Triangle-Three-Buckets) conserva la forma visual de la serie con
+un número fijo de puntos; min/max conserva los extremos de cada cubeta. Solo se
+reduce el rango visible, así que al acercarse se recupera el detalle.
+"""
+import numpy as np
+import pandas as pd
+
+
+PUNTOS_MAX = 2000
+
+
+def _numerico(x):
+    x = np.asarray(x)
+    if np.issubdtype(x.dtype, np.datetime64):
+        return x.astype("datetime64[ns]").astype(np.int64).astype(float)
+    return x.astype(float)
+
+
+def lttb(x, y, umbral):
+    # Índices de los `umbral` puntos elegidos (x debe estar ordenado)
+    n = len(x)
+    if umbral >= n or umbral < 3:
+        return np.arange(n)
+    x, y = _numerico(x), np.asarray(y, dtype=float)
+    bordes = np.linspace(1, n - 1, umbral - 1).astype(int)
+    elegidos = np.empty(umbral, dtype=np.intp)
+    elegidos[0], elegidos[-1] = 0, n - 1
+    a = 0
+    for i in range(umbral - 2):
+        inicio, fin = bordes[i], bordes[i + 1]
+        # Vértice fijo: el promedio de la cubeta siguiente (o el último punto)
+        siguiente = slice(bordes[i + 1], bordes[i + 2] if i + 2 < len(bordes) else n)
+        cx, cy = x[siguiente].mean(), y[siguiente].mean()
+        area = np.abs((x[a] - cx) * (y[inicio:fin] - y[a]) - (x[a] - x[inicio:fin]) * (cy - y[a]))
+        a = inicio + int(np.argmax(area))
+        elegidos[i + 1] = a
+    return elegidos
+
+
+def minmax(y, umbral):
+    # Índices del mínimo y el máximo de cada cubeta (umbral // 2 cubetas)
+    n = len(y)
+    if umbral >= n or umbral < 2:
+        return np.arange(n)
+    cubeta = np.arange(n) * (umbral // 2) // n
+    orden = np.lexsort((np.asarray(y, dtype=float), cubeta))
+    inicios = np.searchsorted(cubeta[orden], np.arange(umbral // 2))
+    finales = np.r_[inicios[1:], n] - 1
+    return np.unique(np.r_[orden[inicios], orden[finales]])
+
+
+def reducir(df, x, y, puntos=PUNTOS_MAX, rango=None, metodo="lttb", por=None):
+    # Filas de `df` a dibujar: recorta al rango visible y reduce cada grupo
+    # de `por` (p. ej. una línea por estación o fase) a lo sumo a `puntos`
+    df = df.dropna(subset=[y]).sort_values(x)
+    if rango is not None:
+        df = df[(df[x] >= pd.Timestamp(rango[0])) & (df[x] <= pd.Timestamp(rango[1]))]
+    grupos = [df] if por is None else [g for _, g in df.groupby(por, observed=True, sort=False)]
+    partes = []
+    for grupo in grupos:
+        cupo = max(3, puntos * len(grupo) // max(len(df), 1))
+        if metodo == "lttb":
+            idx = lttb(grupo[x].to_numpy(), grupo[y].to_numpy(), cupo)
+        else:
+            idx = minmax(grupo[y].to_numpy(), cupo)
+        partes.append(grupo.iloc[idx])
+    return pd.concat(partes).sort_values(x) if partes else df
@@ -0,0 +1,79 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import correlacion
+
+
+VARIABLES = ["Precipitación", "Temperatura", "Humedad"]
+
+
+@pytest.fixture
+def df():
+    rng = np.random.default_rng(1)
+    n = 12 * 20
+    base = rng.normal(size=n)
+    df = pd.DataFrame({
+        "Año": np.repeat(np.arange(2000, 2020), 12),
+        "Precipitación": 300 + 50 * base + rng.normal(0, 20, n),
+        "Temperatura": 20 - base + rng.normal(0, 1, n),
+        "Humedad": 85 + rng.normal(0, 3, n),
+    })
+    df.loc[rng.choice(n, 15, replace=False), "Humedad"] = np.nan
+    return df
+
+
+def test_por_año_coincide_con_pandas(df):
+    est = correlacion.estadisticos_anuales(df, VARIABLES)
+    matrices = correlacion.por_año(est)
+    for año, grupo in df.dropna().groupby("Año"):
+        pd.testing.assert_frame_equal(matrices[año], grupo[VARIABLES].corr(), check_names=False)
+
+
+def test_rango_y_ventana_movil_coinciden_con_pandas(df):
+    est = correlacion.estadisticos_anuales(df, VARIABLES)
+    completos = df.dropna()
+    esperado = completos[completos["Año"].between(2005, 2009)][VARIABLES].corr()
+    pd.testing.assert_frame_equal(correlacion.rango(est, 2005, 2009), esperado, check_names=False)
+
+    ventanas = correlacion.ventana_movil(est, 5, ["Precipitación", "Temperatura"])
+    esperado = completos[completos["Año"].between(2011, 2015)][["Precipitación", "Temperatura"]].corr()
+    pd.testing.assert_frame_equal(ventanas[2015], esperado, check_names=False)
+
+
+def test_menos_de_dos_filas_da_nan():
+    df = pd.DataFrame({"Año": [2000, 2001, 2001], "a": [1.0, 2.0, 3.0], "b": [4.0, 5.0, 7.0]})
+    matrices = correlacion.por_año(correlacion.estadisticos_anuales(df, ["a", "b"]))
+    assert matrices[2000].isna().all().all()
+    assert matrices[2001].loc["a", "b"] == pytest.approx(1.0)
+
+
+def test_figura_animada_frames_y_slider_en_orden(df):
+    est = correlacion.estadisticos_anuales(df, VARIABLES)
+    matrices = correlacion.por_año(est)
+    desordenadas = {año: matrices[año] for año in np.random.default_rng(0).permutation(list(matrices))}
+    fig = correlacion.figura_animada(desordenadas, "Correlación")
+    nombres = [frame.name for frame in fig.frames]
+    assert nombres == [str(año) for año in sorted(matrices)]
+    pasos = fig.layout.sliders[0].steps
+    assert [paso.label for paso in pasos] == nombres
+    assert [paso.args[0][0] for paso in pasos] == nombres
+    assert all(paso.method == "animate" for paso in pasos)
+    np.testing.assert_allclose(fig.data[0].z, matrices[2000].to_numpy())
+
+
+def test_controles_animacion_desde_un_año(df):
+    matrices = correlacion.por_año(correlacion.estadisticos_anuales(df, VARIABLES))
+    fig = correlacion.figura_animada(matrices, "Correlación")
+    controlada = correlacion.controles_animacion(fig, 2005, 0.5)
+    nombres = [frame.name for frame in fig.frames]
+    pos = nombres.index("2005")
+    assert controlada.layout.sliders[0].active == pos
+    np.testing.assert_allclose(controlada.data[0].z, matrices[2005].to_numpy())
+    adelante, atras, pausa = controlada.layout.updatemenus[0].buttons
+    assert list(adelante.args[0]) == nombres[pos:]
+    assert list(atras.args[0]) == nombres[:pos + 1][::-1]
+    assert adelante.args[1]["frame"]["duration"] == 500
+    assert list(pausa.args[0]) == [None]
+    # La figura cacheada no cambia
+    assert fig.layout.updatemenus == ()
@@ -0,0 +1,110 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import cubo
+
+
+@pytest.fixture(scope="module")
+def almacen():
+    rng = np.random.default_rng(3)
+    n = 3000
+    return pd.DataFrame({
+        "Estación": rng.choice(["Estacion 1", "Estacion 2", "Estacion 3"], n),
+        "Fase_ENSO": rng.choice(["Niño", "Neutro", "Niña"], n),
+        "Año": rng.integers(2000, 2010, n),
+        "Mes": rng.choice(["Enero", "Febrero", "Marzo", "Abril"], n),
+        "Precipitación": rng.gamma(2.0, 150.0, n),
+        "SPI": rng.normal(size=n),
+    })
+
+
+@pytest.fixture(scope="module")
+def celdas(almacen):
+    return cubo.construir_cubo(almacen)
+
+
+@pytest.mark.parametrize("q", [0, 0.1, 0.25, 0.5, 0.75, 0.9, 1])
+def test_cuantil_exacto_bajo_la_capacidad(q):
+    valores = np.random.default_rng(4).normal(size=cubo.CAPACIDAD_SKETCH)
+    assert cubo.cuantil(cubo.sketch(valores), q) == pytest.approx(np.quantile(valores, q))
+
+
+def test_sketch_ignora_nan_y_vacio():
+    assert np.isnan(cubo.cuantil(cubo.sketch([np.nan, np.nan]), 0.5))
+    assert cubo.cuantil(cubo.sketch([1.0, np.nan, 3.0]), 0.5) == pytest.approx(2.0)
+
+
+def test_sketch_compactado_aproxima_cuantiles():
+    valores = np.random.default_rng(5).normal(size=20000)
+    sk = cubo.sketch(valores)
+    assert len(sk[0]) <= cubo.CAPACIDAD_SKETCH
+    assert sk[1].sum() == len(valores)
+    for q in (0.1, 0.5, 0.9):
+        # Error en rango: la posición del cuantil estimado dentro de los datos
+        rango = np.mean(valores <= cubo.cuantil(sk, q))
+        assert abs(rango - q) < 0.02
+
+
+def test_fusionar_equivale_a_un_solo_sketch():
+    valores = np.random.default_rng(6).normal(size=300)
+    partes = [cubo.sketch(parte) for parte in np.array_split(valores, 5)]
+    assert cubo.cuantil(cubo.fusionar(partes), 0.5) == pytest.approx(np.median(valores))
+
+
+def test_resumir_coincide_con_groupby(almacen, celdas):
+    tabla = cubo.resumir(celdas, ["Estación"], {
+        "SPI": ["count", "min", "max", "median"],
+        "Precipitación": ["sum", "mean"],
+    }).set_index("Estación")
+    grupos = almacen.groupby("Estación")
+    # Cada estación tiene ~1000 filas: la mediana sale de sketches compactados
+    pd.testing.assert_series_equal(tabla["SPI_count"], grupos["SPI"].count(), check_names=False, check_dtype=False)
+    pd.testing.assert_series_equal(tabla["SPI_min"], grupos["SPI"].min(), check_names=False)
+    pd.testing.assert_series_equal(tabla["SPI_max"], grupos["SPI"].max(), check_names=False)
+    pd.testing.assert_series_equal(tabla["Precipitación_sum"], grupos["Precipitación"].sum(), check_names=False)
+    pd.testing.assert_series_equal(tabla["Precipitación_mean"], grupos["Precipitación"].mean(), check_names=False)
+    np.testing.assert_allclose(tabla["SPI_median"], grupos["SPI"].median(), atol=0.1)
+
+
+def test_resumir_sin_agrupar(almacen, celdas):
+    tabla = cubo.resumir(celdas, [], {"Precipitación": ["sum", "max"]})
+    assert len(tabla) == 1
+    assert tabla["Precipitación_sum"].iloc[0] == pytest.approx(almacen["Precipitación"].sum())
+    assert tabla["Precipitación_max"].iloc[0] == almacen["Precipitación"].max()
+
+
+@pytest.mark.parametrize("por", [[], ["Estación"], ["Año", "Estación"]])
+def test_resumir_seleccion_vacia(celdas, por):
+    # Sin años o sin meses elegidos: tabla vacía con las columnas esperadas
+    tabla = cubo.resumir(celdas.iloc[:0], por, {"SPI": ["median", "min"], "Precipitación": ["sum"]})
+    assert tabla.empty
+    assert list(tabla.columns) == por + ["SPI_median", "SPI_min", "Precipitación_sum"]
+
+
+def test_resumen_caja_coincide_con_cuartiles():
+    # Pocas filas por fase: sketches exactos, cuartiles iguales a los de numpy
+    rng = np.random.default_rng(7)
+    almacen = pd.DataFrame({
+        "Estación": "Estacion 1",
+        "Fase_ENSO": rng.choice(["Niño", "Neutro", "Niña"], 300),
+        "Año": rng.integers(2000, 2005, 300),
+        "Mes": "Enero",
+        "Precipitación": rng.gamma(2.0, 150.0, 300),
+        "SPI": rng.normal(size=300),
+    })
+    cajas = cubo.resumen_caja(cubo.construir_cubo(almacen), ["Fase_ENSO"], "SPI").set_index("Fase_ENSO")
+    for fase, grupo in almacen.groupby("Fase_ENSO"):
+        valores = grupo["SPI"].to_numpy()
+        q1, mediana, q3 = np.quantile(valores, [0.25, 0.5, 0.75])
+        caja = cajas.loc[fase]
+        assert (caja["q1"], caja["mediana"], caja["q3"]) == pytest.approx((q1, mediana, q3))
+        assert caja["n"] == len(valores)
+        dentro = valores[(valores >= q1 - 1.5 * (q3 - q1)) & (valores <= q3 + 1.5 * (q3 - q1))]
+        assert (caja["bigote_inf"], caja["bigote_sup"]) == pytest.approx((dentro.min(), dentro.max()))
+
+
+def test_resumen_caja_seleccion_vacia(celdas):
+    cajas = cubo.resumen_caja(celdas.iloc[:0], ["Estación"], "SPI")
+    assert cajas.empty
+    assert {"Estación", "q1", "mediana", "q3"} <= set(cajas.columns)
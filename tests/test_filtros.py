@@ -0,0 +1,72 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import filtros
+
+
+@pytest.fixture
+def df():
+    rng = np.random.default_rng(2)
+    n = 1000
+    return pd.DataFrame({
+        "Año": rng.integers(1992, 2023, n),
+        "Mes": pd.Categorical(rng.choice(["Enero", "Febrero", "Marzo"], n)),
+        "Fase_ENSO": rng.choice(["Niño", "Neutro", "Niña"], n),
+        "SPI": rng.normal(size=n),
+    })
+
+
+def esperado(df, **filtro):
+    mascara = np.ones(len(df), dtype=bool)
+    for col, valores in filtro.items():
+        if valores is not None:
+            mascara &= df[col].isin(valores).to_numpy()
+    return df[mascara]
+
+
+@pytest.mark.parametrize("filtro", [
+    {},
+    {"Año": [1995, 2000, 2010]},
+    {"Año": list(range(2000, 2010)), "Mes": ["Enero"], "Fase_ENSO": ["Niña", "Niño"]},
+    {"Mes": None, "Fase_ENSO": ["Neutro"]},
+    {"Año": []},
+    {"Año": [1800]},
+])
+def test_filtrar_coincide_con_isin(df, filtro):
+    indice = filtros.IndiceFiltros(df)
+    pd.testing.assert_frame_equal(indice.filtrar(**filtro), esperado(df, **filtro))
+    # La segunda consulta sale del memo y da lo mismo
+    pd.testing.assert_frame_equal(indice.filtrar(**filtro), esperado(df, **filtro))
+
+
+def test_valores_presentes_y_columnas(df):
+    indice = filtros.IndiceFiltros(df)
+    assert indice.valores["Año"] == sorted(df["Año"].unique())
+    assert list(indice.filtrar(["SPI"], Año=[2000]).columns) == ["SPI"]
+
+
+def test_memo_acotado(df):
+    indice = filtros.IndiceFiltros(df, max_entradas=3)
+    for año in range(1992, 2000):
+        indice.filtrar(Año=[año])
+    assert len(indice._memo) == 3
+
+
+def test_acotar_interseca_con_el_filtro_compartido():
+    base = {"Año": [2000, 2001, 2002], "Mes": ["Enero", "Febrero"], "Fase_ENSO": ["Niño"]}
+    delta = {"Año": [2001, 2005], "Mes": ["Febrero"], "Fase_ENSO": ["Niño"]}
+    assert filtros.acotar(base, delta) == {"Año": [2001], "Mes": ["Febrero"], "Fase_ENSO": ["Niño"]}
+
+
+def test_acotar_vuelve_al_compartido_si_el_delta_queda_fuera():
+    # La selección global se acotó después: el delta viejo ya no está entre las opciones
+    base = {"Año": [2000, 2001], "Mes": ["Enero"], "Fase_ENSO": ["Niño", "Niña"]}
+    delta = {"Año": [], "Mes": ["Marzo"], "Fase_ENSO": ["Niña"]}
+    assert filtros.acotar(base, delta) == {"Año": [2000, 2001], "Mes": ["Enero"], "Fase_ENSO": ["Niña"]}
+
+
+def test_acotar_con_compartido_vacio_no_devuelve_filas(df):
+    base = {"Año": [], "Mes": ["Enero"], "Fase_ENSO": ["Niño"]}
+    acotado = filtros.acotar(base, {"Año": [2000], "Mes": ["Enero"], "Fase_ENSO": ["Niño"]})
+    assert filtros.IndiceFiltros(df).filtrar(**acotado).empty
@@ -0,0 +1,49 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import submuestreo
+from secciones import graficos
+
+
+def serie(n):
+    return pd.DataFrame({
+        "Fecha": pd.date_range("1900-01-01", periods=n, freq="D"),
+        "SPI": np.sin(np.arange(n) / 50),
+    })
+
+
+@pytest.mark.parametrize("n, modo, traza", [
+    (9999, "svg", "scatter"),
+    (10000, "svg", "scatter"),
+    (10001, "webgl", "scattergl"),
+])
+def test_umbral_webgl(n, modo, traza):
+    assert graficos.modo_render(n) == modo
+    assert graficos.traza_scatter(n, x=[0], y=[0]).type == traza
+
+
+@pytest.mark.parametrize("n, traza, puntos", [
+    (10000, "scatter", submuestreo.PUNTOS_MAX),
+    (10001, "scattergl", submuestreo.PUNTOS_MAX),
+])
+def test_serie_larga_reducida_y_en_webgl_sobre_el_umbral(n, traza, puntos):
+    fig = graficos.grafico_serie_spi(serie(n))
+    assert fig.data[0].type == traza
+    assert len(fig.data[0].x) == puntos
+    # Reducida: línea simple, sin marcadores ni spline
+    assert fig.data[0].line.shape in (None, "linear")
+
+
+def test_serie_corta_sin_reducir():
+    n = submuestreo.PUNTOS_MAX
+    fig = graficos.grafico_serie_spi(serie(n))
+    assert len(fig.data[0].x) == n
+    assert fig.data[0].line.shape == "spline"
+
+
+@pytest.mark.parametrize("n, se_muestran", [(4999, True), (5000, True), (5001, False)])
+def test_umbral_de_puntos_individuales(n, se_muestran):
+    df = serie(n)
+    assert (graficos.filas_para_puntos(df, True) is df) == se_muestran
+    assert graficos.filas_para_puntos(df, False) is None
@@ -0,0 +1,143 @@
+import numpy as np
+import pytest
+
+import mapa
+
+
+def douglas_peucker_referencia(puntos, tol):
+    # Versión recursiva clásica (Ramer-Douglas-Peucker)
+    if len(puntos) < 3:
+        return list(puntos)
+    a, b = np.asarray(puntos[0]), np.asarray(puntos[-1])
+    ab = b - a
+    largo = np.hypot(*ab)
+    distancias = [
+        np.hypot(*(np.asarray(p) - a)) if largo == 0
+        else abs(ab[0] * (p[1] - a[1]) - ab[1] * (p[0] - a[0])) / largo
+        for p in puntos[1:-1]
+    ]
+    i = int(np.argmax(distancias))
+    if distancias[i] <= tol:
+        return [puntos[0], puntos[-1]]
+    k = i + 1
+    return douglas_peucker_referencia(puntos[:k + 1], tol)[:-1] + douglas_peucker_referencia(puntos[k:], tol)
+
+
+@pytest.mark.parametrize("tol", [0.001, 0.01, 0.05])
+def test_douglas_peucker_coincide_con_la_referencia(tol):
+    rng = np.random.default_rng(11)
+    t = np.linspace(0, 2 * np.pi, 400)
+    linea = np.c_[t, np.sin(t) + rng.normal(0, 0.01, len(t))].tolist()
+    np.testing.assert_allclose(mapa.douglas_peucker(linea, tol), douglas_peucker_referencia(linea, tol))
+
+
+def test_douglas_peucker_anillo_cerrado():
+    t = np.linspace(0, 2 * np.pi, 200)
+    anillo = np.c_[np.cos(t), np.sin(t)]
+    anillo[-1] = anillo[0]
+    simple = mapa.douglas_peucker(anillo, 0.01)
+    np.testing.assert_allclose(simple, douglas_peucker_referencia(anillo.tolist(), 0.01))
+    assert 4 <= len(simple) < len(anillo)
+    np.testing.assert_array_equal(simple[0], simple[-1])
+
+
+def test_simplificar_descarta_anillos_degenerados():
+    cuadrado = [[0, 0], [1, 0], [1, 1], [0, 1], [0, 0]]
+    diminuto = [[5, 5], [5.0001, 5], [5.0001, 5.0001], [5, 5]]
+    geojson = {"features": [{"geometry": {"type": "Polygon", "coordinates": [cuadrado, diminuto]}}]}
+    simple = mapa.simplificar(geojson, 0.01)
+    assert simple["features"][0]["geometry"]["coordinates"] == [[cuadrado]]
+
+
+# --- Atributos por año frente al bucle por estación ---
+
+VARIABLES = ["Precipitacion (mm)", "SPI", "Temperatura (Â°C)", "Humedad (%)"]
+
+
+@pytest.fixture(scope="module")
+def tablas():
+    import datos
+
+    return {
+        f"Estación {i}": datos.leer_tabla(datos.ruta_archivo(f"Estacion {i}", "Resumen_Anual.xlsx"))
+        for i in range(1, 7)
+    }
+
+
+def atributos_referencia(tablas, variable, año):
+    # Bucle de la versión anterior del mapa: una estación y un año a la vez
+    import matplotlib.colors as mcolors
+    import matplotlib.pyplot as plt
+
+    valores = [v for df in tablas.values() for v in df[variable].dropna().values]
+    norm = mcolors.Normalize(vmin=min(valores), vmax=max(valores))
+    cmap = plt.get_cmap("RdYlBu")
+
+    temporales = []
+    for nombre, df in tablas.items():
+        fila = df[df["Año"] == año]
+        if fila.empty or np.isnan(fila[variable].values[0]):
+            continue
+        valor = fila[variable].values[0]
+        if variable == "SPI":
+            crit = abs(valor)
+        elif variable == "Humedad (%)":
+            crit = max(0, valor - 90)
+        elif variable == "Temperatura (Â°C)":
+            crit = max(0, valor - 25)
+        else:
+            crit = 0
+        temporales.append((nombre, crit, valor))
+
+    mas = max(temporales, key=lambda x: x[1])[0]
+    menos = min(temporales, key=lambda x: x[1])[0]
+    rangos = {n: r for r, (n, _, _) in enumerate(sorted(temporales, key=lambda x: -x[1]), start=1)}
+
+    salida = {}
+    for nombre, crit, valor in temporales:
+        if variable == "SPI" and valor <= -1:
+            color = [255, 0, 0, 255]
+        elif variable == "SPI" and valor >= 1:
+            color = [0, 0, 200, 255]
+        elif variable == "Humedad (%)" and valor >= 90:
+            color = [128, 0, 128, 255]
+        elif variable == "Temperatura (Â°C)" and valor >= 25:
+            color = [255, 215, 0, 255]
+        else:
+            color = [int(x * 255) for x in mcolors.to_rgba(cmap(norm(valor)))]
+        icono = "peligro" if nombre == mas else "alerta" if nombre == menos else "normal"
+        salida[nombre] = {"color": color, "value": round(valor, 2), "rango": rangos[nombre], "icon_data": icono}
+    return salida
+
+
+def comparar_con_referencia(tablas, variable):
+    coords = {nombre: (0.0, 0.0) for nombre in tablas}
+    atributos = mapa.atributos_por_año(tablas, variable)
+    for año in mapa.AÑOS:
+        esperado = atributos_referencia(tablas, variable, año)
+        filas = mapa.registros(atributos, año, coords)
+        assert [f["name"] for f in filas] == list(esperado)
+        for fila in filas:
+            ref = esperado[fila["name"]]
+            assert fila["año"] == año
+            assert fila["value"] == pytest.approx(ref["value"])
+            assert fila["rango"] == ref["rango"]
+            assert fila["icon_data"] == ref["icon_data"]
+            # La escala continua puede diferir en una unidad por redondeo
+            np.testing.assert_allclose(fila["color"], ref["color"], atol=1)
+
+
+@pytest.mark.parametrize("variable", VARIABLES)
+def test_atributos_coinciden_con_el_bucle_por_estacion(tablas, variable):
+    comparar_con_referencia(tablas, variable)
+
+
+@pytest.mark.parametrize("variable", ["SPI", "Humedad (%)"])
+def test_atributos_con_años_faltantes(tablas, variable):
+    # Los libros reales están completos: se quitan años para cubrir las estaciones sin dato
+    recortadas = dict(tablas)
+    recortadas["Estación 2"] = tablas["Estación 2"][tablas["Estación 2"]["Año"] % 3 != 0]
+    faltantes = tablas["Estación 4"].copy()
+    faltantes.loc[faltantes["Año"] % 4 == 0, variable] = np.nan
+    recortadas["Estación 4"] = faltantes
+    comparar_con_referencia(recortadas, variable)
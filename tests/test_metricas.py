@@ -0,0 +1,114 @@
+import json
+import re
+import time
+
+import pytest
+
+import metricas
+
+
+NOMBRE = r"[a-zA-Z_:][a-zA-Z0-9_:]*"
+ETIQUETA = r'([a-zA-Z_][a-zA-Z0-9_]*)="((?:[^"\\\n]|\\.)*)"'
+MUESTRA = re.compile(rf"^({NOMBRE})\{{((?:{ETIQUETA},?)*)\}} (\S+)$")
+
+
+@pytest.fixture(autouse=True)
+def limpio(monkeypatch):
+    monkeypatch.delenv("ENSO_METRICAS_JSONL", raising=False)
+    monkeypatch.delenv("ENSO_METRICAS_PROM", raising=False)
+    monkeypatch.setattr(metricas, "_totales", {})
+    metricas.iniciar("prueba")
+
+
+def desescapar(valor):
+    return re.sub(r"\\(.)", lambda m: "\n" if m.group(1) == "n" else m.group(1), valor)
+
+
+def test_etapa_mide_y_anida():
+    with metricas.etapa("carga", "tabla") as padre:
+        time.sleep(0.01)
+        with metricas.etapa("transformacion") as hijo:
+            hijo["bytes"] = 128
+    lista = metricas.mediciones()
+    assert [m["etapa"] for m in lista] == ["carga", "transformacion"]
+    assert padre == {"seccion": "prueba", "etapa": "carga", "detalle": "tabla", "nivel": 0,
+                     "ms": padre["ms"], "bytes": None}
+    assert padre["ms"] >= 10
+    assert (hijo["nivel"], hijo["bytes"]) == (1, 128)
+    assert hijo["ms"] <= padre["ms"]
+
+
+def test_medir_usa_el_nombre_de_la_funcion():
+    @metricas.medir("figura")
+    def dibujar():
+        return 7
+
+    assert dibujar() == 7
+    (m,) = metricas.mediciones()
+    assert (m["etapa"], m["detalle"], m["nivel"]) == ("figura", "dibujar", 0)
+
+
+def test_exportar_sin_destino_no_escribe(tmp_path):
+    with metricas.etapa("carga"):
+        pass
+    metricas.exportar()
+    assert metricas._totales == {}
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_exportar_jsonl(tmp_path, monkeypatch):
+    ruta = tmp_path / "metricas.jsonl"
+    monkeypatch.setenv("ENSO_METRICAS_JSONL", str(ruta))
+    with metricas.etapa("exportacion", "ZIP") as m:
+        m["bytes"] = 2048
+    metricas.exportar()
+    metricas.exportar()  # cada exportación añade líneas, no reescribe
+
+    lineas = ruta.read_text(encoding="utf-8").splitlines()
+    assert len(lineas) == 2
+    registro = json.loads(lineas[0])
+    assert set(registro) == {"ts", "seccion", "etapa", "detalle", "nivel", "ms", "bytes"}
+    assert (registro["seccion"], registro["etapa"], registro["detalle"]) == ("prueba", "exportacion", "ZIP")
+    assert registro["nivel"] == 0 and registro["bytes"] == 2048
+    assert registro["ms"] == pytest.approx(m["ms"])
+    time.strptime(registro["ts"][:19], "%Y-%m-%dT%H:%M:%S")
+    assert metricas._totales[("prueba", "exportacion", "ZIP")][0] == 2
+
+
+def test_prometheus_formato_y_escapado(tmp_path, monkeypatch):
+    ruta = tmp_path / "static" / "metricas.txt"
+    monkeypatch.setenv("ENSO_METRICAS_PROM", str(ruta))
+    detalle = 'ruta "C:\\datos"\nsegunda línea'
+    with metricas.etapa("figura", detalle) as m:
+        m["bytes"] = 512
+    with metricas.etapa("carga"):
+        pass
+    metricas.exportar()
+
+    texto = ruta.read_text(encoding="utf-8")
+    assert texto == metricas.prometheus() and texto.endswith("\n")
+    tipos = {}
+    muestras = []
+    for linea in texto.splitlines():
+        if linea.startswith("# TYPE "):
+            _, _, nombre, tipo = linea.split(" ")
+            assert re.fullmatch(NOMBRE, nombre)
+            tipos[nombre] = tipo
+        elif linea.startswith("# HELP "):
+            assert re.fullmatch(NOMBRE, linea.split(" ")[2])
+        else:
+            coincide = MUESTRA.match(linea)
+            assert coincide, linea
+            nombre, etiquetas, valor = coincide.group(1), coincide.group(2), coincide.group(5)
+            float(valor)
+            muestras.append((nombre, dict(re.findall(ETIQUETA, etiquetas))))
+    assert tipos == {"enso_etapa_segundos": "summary", "enso_etapa_bytes_total": "counter"}
+
+    familias = {"enso_etapa_segundos_count": "enso_etapa_segundos", "enso_etapa_segundos_sum": "enso_etapa_segundos",
+                "enso_etapa_bytes_total": "enso_etapa_bytes_total"}
+    assert all(nombre in familias for nombre, _ in muestras)
+    detalles = {desescapar(e["detalle"]) for _, e in muestras}
+    assert detalles == {detalle, ""}
+    # Solo las etapas con bytes aparecen en el contador
+    bytes_ = [e for nombre, e in muestras if nombre == "enso_etapa_bytes_total"]
+    assert len(bytes_) == 1 and desescapar(bytes_[0]["detalle"]) == detalle
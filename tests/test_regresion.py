@@ -0,0 +1,50 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import regresion
+
+
+@pytest.fixture
+def df():
+    rng = np.random.default_rng(10)
+    n = 600
+    spi = rng.normal(size=n)
+    df = pd.DataFrame({
+        "SPI": spi,
+        "Precipitación": 1e4 + 120 * spi + rng.normal(0, 40, n),
+        "Fase_ENSO": rng.choice(["Niño", "Neutro", "Niña"], n),
+    })
+    df.loc[rng.choice(n, 20, replace=False), "Precipitación"] = np.nan
+    return df
+
+
+def referencia(x, y):
+    pendiente, intercepto = np.polyfit(x, y, 1)
+    return pendiente, intercepto, np.corrcoef(x, y)[0, 1] ** 2
+
+
+def test_ajustar_grupos_coincide_con_polyfit(df):
+    ajustes = regresion.ajustar_grupos(df, "SPI", "Precipitación", por="Fase_ENSO").set_index("Fase_ENSO")
+    for fase, grupo in df.dropna().groupby("Fase_ENSO"):
+        fila = ajustes.loc[fase]
+        assert (fila["pendiente"], fila["intercepto"], fila["r2"]) == pytest.approx(
+            referencia(grupo["SPI"], grupo["Precipitación"]), rel=1e-9
+        )
+        assert fila["n"] == len(grupo)
+        assert (fila["x_min"], fila["x_max"]) == (grupo["SPI"].min(), grupo["SPI"].max())
+
+
+def test_ajustar_sin_grupos(df):
+    completos = df.dropna()
+    ajuste = regresion.ajustar(completos["SPI"], completos["Precipitación"])
+    assert (ajuste["pendiente"], ajuste["intercepto"], ajuste["r2"]) == pytest.approx(
+        referencia(completos["SPI"], completos["Precipitación"]), rel=1e-9
+    )
+
+
+def test_grupo_degenerado_da_nan():
+    df = pd.DataFrame({"x": [1.0, 1.0, 2.0, 3.0], "y": [5.0, 6.0, 1.0, 2.0], "g": ["a", "a", "b", "b"]})
+    ajustes = regresion.ajustar_grupos(df, "x", "y", por="g").set_index("g")
+    assert np.isnan(ajustes.loc["a", "pendiente"])
+    assert ajustes.loc["b", "pendiente"] == pytest.approx(1.0)
@@ -0,0 +1,67 @@
+import math
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import submuestreo
+
+
+def lttb_referencia(x, y, umbral):
+    # Implementación original de Steinarsson (2013), punto a punto
+    n = len(x)
+    cada = (n - 2) / (umbral - 2)
+    elegidos = [0]
+    a = 0
+    for i in range(umbral - 2):
+        inicio_prom = math.floor((i + 1) * cada) + 1
+        fin_prom = min(math.floor((i + 2) * cada) + 1, n)
+        prom_x = sum(x[inicio_prom:fin_prom]) / (fin_prom - inicio_prom)
+        prom_y = sum(y[inicio_prom:fin_prom]) / (fin_prom - inicio_prom)
+        inicio = math.floor(i * cada) + 1
+        fin = math.floor((i + 1) * cada) + 1
+        mejor, area_max = inicio, -1.0
+        for j in range(inicio, fin):
+            area = abs((x[a] - prom_x) * (y[j] - y[a]) - (x[a] - x[j]) * (prom_y - y[a])) * 0.5
+            if area > area_max:
+                mejor, area_max = j, area
+        elegidos.append(mejor)
+        a = mejor
+    elegidos.append(n - 1)
+    return elegidos
+
+
+@pytest.mark.parametrize("n, umbral", [(1000, 100), (5000, 2000), (777, 50), (10, 5)])
+def test_lttb_coincide_con_la_referencia(n, umbral):
+    rng = np.random.default_rng(n)
+    x = np.arange(n, dtype=float)
+    y = np.cumsum(rng.normal(size=n))
+    assert submuestreo.lttb(x, y, umbral).tolist() == lttb_referencia(x.tolist(), y.tolist(), umbral)
+
+
+def test_lttb_sin_reducir_y_con_fechas():
+    assert submuestreo.lttb(np.arange(10), np.arange(10), 20).tolist() == list(range(10))
+    fechas = pd.date_range("2000-01-01", periods=500, freq="D").to_numpy()
+    idx = submuestreo.lttb(fechas, np.sin(np.arange(500) / 10), 50)
+    assert len(idx) == 50 and idx[0] == 0 and idx[-1] == 499
+    assert np.all(np.diff(idx) > 0)
+
+
+def test_minmax_conserva_extremos():
+    y = np.random.default_rng(8).normal(size=1000)
+    idx = submuestreo.minmax(y, 100)
+    assert len(idx) <= 100
+    assert y.argmin() in idx and y.argmax() in idx
+
+
+def test_reducir_por_grupo_y_rango():
+    fechas = pd.date_range("1992-01-01", periods=3000, freq="D")
+    df = pd.DataFrame({
+        "Fecha": np.tile(fechas, 2),
+        "SPI": np.random.default_rng(9).normal(size=6000),
+        "Estación": np.repeat(["Estacion 1", "Estacion 2"], 3000),
+    })
+    reducido = submuestreo.reducir(df, "Fecha", "SPI", puntos=400, por="Estación")
+    assert reducido.groupby("Estación").size().tolist() == [200, 200]
+    visible = submuestreo.reducir(df, "Fecha", "SPI", rango=("1995-01-01", "1995-12-31"))
+    assert visible["Fecha"].between("1995-01-01", "1995-12-31").all()
@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+import pywt
+
+import wavelet
+
+
+@pytest.mark.parametrize("nombre_wavelet", wavelet.WAVELETS)
+def test_cwt_fft_coincide_con_pywt(nombre_wavelet):
+    senal = np.random.default_rng(0).normal(size=372)
+    escalas = np.arange(1, 64)
+    esperado, _ = pywt.cwt(senal, escalas, wavelet=nombre_wavelet)
+    np.testing.assert_allclose(wavelet.cwt_fft(senal, escalas, nombre_wavelet), esperado, atol=1e-8)
+
+
+def test_transformar_con_ambos_motores():
+    senal = np.sin(np.linspace(0, 20, 200))
+    fft = wavelet.transformar(senal, "morl", 32, motor="fft")
+    conv = wavelet.transformar(senal, "morl", 32, motor="conv")
+    assert fft.shape == conv.shape == (31, 200)
+    np.testing.assert_allclose(fft, conv, atol=1e-4)
+
+
+def test_magnitud_solo_usa_el_precalculo_con_fft(monkeypatch):
+    senal = np.cos(np.linspace(0, 30, 120))
+    precalculo = np.full((15, 120), 7.0, dtype=np.float32)
+    monkeypatch.setattr(wavelet, "_precalculado", lambda *args: precalculo)
+    mag_fft, _ = wavelet.magnitud("prueba_motor", "SPI", "morl", 16, senal, motor="fft")
+    mag_conv, _ = wavelet.magnitud("prueba_motor", "SPI", "morl", 16, senal, motor="conv")
+    assert mag_fft is precalculo
+    np.testing.assert_allclose(mag_conv, wavelet.transformar(senal, "morl", 16, motor="conv"))
+
+
+@pytest.mark.parametrize("total, nivel", [(1000, 95), (12345, 95), (7, 50), (500, 99), (40, 100)])
+def test_percentil_desde_la_cola_coincide_con_numpy(total, nivel):
+    valores = np.random.default_rng(total).normal(size=(4, total)).astype(np.float32)
+    k = wavelet._cola_superior(total, nivel)
+    cola = None
+    for bloque in np.array_split(valores, 7, axis=1):
+        cola = wavelet._mayores(cola, bloque, k)
+    assert cola.shape == (4, min(k, total))
+    np.testing.assert_allclose(wavelet._percentil_de_cola(cola, total, nivel), np.percentile(valores, nivel, axis=1), rtol=1e-6)
+
+
+def test_significancia_acotada_y_determinista():
+    senal = np.random.default_rng(12).normal(size=150)
+    a = wavelet.significancia(senal, "morl", 16, senal_y=np.sign(senal), n_sims=20)
+    b = wavelet.significancia(senal, "morl", 16, senal_y=np.sign(senal), n_sims=20)
+    assert set(a) == {"potencia", "global", "coherencia"}
+    assert all(a[k].shape == (15,) for k in a)
+    assert all(np.array_equal(a[k], b[k]) for k in a)
+    assert np.all((a["coherencia"] >= 0) & (a["coherencia"] <= 1))
+    assert wavelet.simulaciones_permitidas(200, 256) * 255 <= wavelet.MAX_SIMULACIONES_ESCALAS
+    assert wavelet.simulaciones_permitidas(200, 64) == 200
+
+
+def test_kernels_cuentan_en_la_cache_acotada():
+    escalas = tuple(range(1, 32))
+    wavelet.cwt_fft(np.zeros(333), escalas, "mexh")
+    espectros, _, _ = wavelet.CACHE.get(("kernels", "mexh", escalas, 333))
+    assert wavelet.CACHE.bytes >= espectros.nbytes
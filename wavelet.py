@@ -0,0 +1,462 @@
+"""Transformada wavelet continua con caché compartida y precálculo offline.
+
+Cada escala de la CWT se calcula de forma independiente, así que la transformada
+con 255 escalas contiene la de cualquier número menor de escalas como un slice
+de filas. `python wavelet.py` precalcula esa transformada completa para cada
+estación, variable y wavelet, y la guarda en data/snapshot/wavelet/.
+"""
+import inspect
+import io
+import multiprocessing
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pywt
+
+import datos
+
+
+WAVELETS = ["mexh", "gaus1", "gaus2", "morl"]
+MOTORES = {"FFT": "fft", "Convolución (pywt)": "conv"}
+# Paletas de Matplotlib y su equivalente en Plotly
+PALETAS = {
+    "coolwarm": "RdBu_r",
+    "viridis": "Viridis",
+    "plasma": "Plasma",
+    "inferno": "Inferno",
+    "cividis": "Cividis",
+}
+MAX_COLUMNAS = 1000
+# Índice ENSO numérico derivado de la fase: los datos solo traen la etiqueta
+INDICE_ENSO = {"Niño": 1.0, "Neutro": 0.0, "Niña": -1.0}
+# Columnas de tiempo que cada simulación Monte Carlo aporta a la distribución nula
+MUESTRAS_POR_SIMULACION = 500
+# Simulaciones por bloque; de cada bloque solo se guarda la cola superior
+BLOQUE_SIMULACIONES = 16
+# Tope de simulaciones × escalas por cálculo (~6 s con coherencia en un núcleo)
+MAX_SIMULACIONES_ESCALAS = 100 * 255
+ESCALA_MAX = 256
+PRECALCULO_DIR = os.path.join(datos.SNAPSHOT_DIR, "wavelet")
+CACHE_MAX_BYTES = 256 * 1024 * 1024
+
+# Resolución con la que pywt.cwt integra la wavelet (10 en versiones antiguas)
+_param_precision = inspect.signature(pywt.cwt).parameters.get("precision")
+PRECISION = _param_precision.default if _param_precision is not None else 10
+
+
+# --- Caché LRU acotada por memoria ---
+class CacheLRU:
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self._datos = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, clave):
+        with self._lock:
+            if clave not in self._datos:
+                return None
+            self._datos.move_to_end(clave)
+            return self._datos[clave][0]
+
+    def put(self, clave, valor, tamaño):
+        with self._lock:
+            if clave in self._datos:
+                self.bytes -= self._datos.pop(clave)[1]
+            self._datos[clave] = (valor, tamaño)
+            self.bytes += tamaño
+            while self.bytes > self.max_bytes and len(self._datos) > 1:
+                _, (_, liberado) = self._datos.popitem(last=False)
+                self.bytes -= liberado
+
+
+CACHE = CacheLRU(CACHE_MAX_BYTES)
+
+
+# --- Cálculo ---
+def variables(df):
+    # El año es un contador, no una señal climática
+    return [col for col in df.select_dtypes(include="number").columns if col != "Año"]
+
+
+def preparar_senal(serie):
+    return serie.interpolate(method="linear").bfill().to_numpy(dtype=float)
+
+
+def transformar(senal, nombre_wavelet, num_escala, motor="fft"):
+    if motor == "fft":
+        coef = cwt_fft(senal, np.arange(1, num_escala), nombre_wavelet)
+    else:
+        coef, _ = pywt.cwt(senal, np.arange(1, num_escala), wavelet=nombre_wavelet)
+    return np.abs(coef).astype(np.float32)
+
+
+# --- Motor FFT ---
+# Reproduce el algoritmo de pywt.cwt (wavelet integrada, re-muestreada por
+# escala, convolución, diferencia y recorte central), pero con los kernels de
+# todas las escalas ya transformados al dominio de frecuencia y una sola
+# irfft vectorizada para todas las escalas, en lugar de una convolución directa
+# por escala.
+def _kernels_fft(nombre_wavelet, escalas, n):
+    # Los espectros ocupan de ~10 MB (n=372) a ~30 MB (n=11000) por entrada:
+    # van a la misma caché acotada por bytes que las transformadas
+    return _cacheado(("kernels", nombre_wavelet, escalas, n), lambda: _calcular_kernels(nombre_wavelet, escalas, n))
+
+
+def _calcular_kernels(nombre_wavelet, escalas, n):
+    int_psi, x = pywt.integrate_wavelet(pywt.ContinuousWavelet(nombre_wavelet), precision=PRECISION)
+    paso = x[1] - x[0]
+    kernels = []
+    for escala in escalas:
+        j = (np.arange(escala * (x[-1] - x[0]) + 1) / (escala * paso)).astype(int)
+        kernels.append(int_psi[j[j < int_psi.size]][::-1])
+    largos = np.array([k.size for k in kernels])
+    if largos.min() < 2:
+        raise ValueError(f"Escala de {escalas[int(largos.argmin())]} demasiado pequeña.")
+    tamaño = _largo_rapido(n + largos.max() - 1)
+    espectros = np.stack([np.fft.rfft(k, tamaño) for k in kernels])
+    # Índice de inicio del recorte central de cada escala tras np.diff
+    inicios = (largos - 2) // 2
+    return espectros, inicios, tamaño
+
+
+def _largo_rapido(n):
+    # Siguiente tamaño 2^a·3^b·5^c >= n, rápido para la FFT de numpy
+    mejor = 1 << int(np.ceil(np.log2(n)))
+    p5 = 1
+    while p5 < mejor:
+        p35 = p5
+        while p35 < mejor:
+            p = p35
+            while p < n:
+                p *= 2
+            mejor = min(mejor, p)
+            p35 *= 3
+        p5 *= 5
+    return mejor
+
+
+def cwt_fft(senal, escalas, nombre_wavelet):
+    senal = np.asarray(senal, dtype=float)
+    escalas = tuple(np.atleast_1d(escalas).tolist())
+    n = senal.size
+    espectros, inicios, tamaño = _kernels_fft(nombre_wavelet, escalas, n)
+    conv = np.fft.irfft(espectros * np.fft.rfft(senal, tamaño), tamaño, axis=-1)
+    # coef[i] = conv[inicio + i + 1] - conv[inicio + i] para i en [0, n)
+    idx = inicios[:, None] + np.arange(n)[None, :]
+    coef = np.take_along_axis(conv, idx + 1, axis=-1) - np.take_along_axis(conv, idx, axis=-1)
+    return -np.sqrt(np.asarray(escalas, dtype=float))[:, None] * coef
+
+
+def ruta_precalculo(estacion, variable, nombre_wavelet):
+    archivo = f"{variable}_{nombre_wavelet}.npy".replace("/", "_").replace(" ", "_")
+    return os.path.join(PRECALCULO_DIR, estacion, archivo)
+
+
+def _precalculado(estacion, variable, nombre_wavelet, num_escala):
+    ruta = ruta_precalculo(estacion, variable, nombre_wavelet)
+    if not os.path.exists(ruta):
+        return None
+    if os.path.getmtime(ruta) < max(os.path.getmtime(r) for r in datos.fuentes_almacen()):
+        return None
+    completa = np.load(ruta, mmap_mode="r")
+    if completa.shape[0] < num_escala - 1:
+        return None
+    return completa[: num_escala - 1]
+
+
+def indice_enso(df):
+    return preparar_senal(df["Fase_ENSO"].astype(object).map(INDICE_ENSO).astype(float))
+
+
+def _cacheado(clave, calcular):
+    resultado = CACHE.get(clave)
+    if resultado is None:
+        resultado = calcular()
+        tamaño = sum(np.asarray(v).nbytes for v in (resultado if isinstance(resultado, tuple) else (resultado,)))
+        CACHE.put(clave, resultado, tamaño)
+    return resultado
+
+
+def coeficientes(estacion, variable, nombre_wavelet, num_escala, senal, version=None):
+    # Coeficientes con signo, necesarios para el espectro cruzado y la coherencia
+    clave = ("coef", estacion, variable, nombre_wavelet, num_escala, version)
+    return _cacheado(clave, lambda: cwt_fft(senal, np.arange(1, num_escala), nombre_wavelet))
+
+
+def magnitud(estacion, variable, nombre_wavelet, num_escala, senal, version=None, motor="fft"):
+    # Devuelve (|coef|, percentil 99) para recortar la escala de color
+    clave = (estacion, variable, nombre_wavelet, num_escala, version, motor)
+    resultado = CACHE.get(clave)
+    if resultado is not None:
+        return resultado
+    # El precálculo del build sale del motor FFT; con pywt se calcula aquí
+    mag = _precalculado(estacion, variable, nombre_wavelet, num_escala) if motor == "fft" else None
+    if mag is None or mag.shape[1] != len(senal):
+        mag = transformar(senal, nombre_wavelet, num_escala, motor)
+    resultado = (mag, float(np.percentile(mag, 99)))
+    CACHE.put(clave, resultado, mag.nbytes)
+    return resultado
+
+
+# --- Espectro global, espectro cruzado y coherencia ---
+def espectro_global(coef):
+    # Potencia promediada en el tiempo para cada escala
+    return np.mean(np.asarray(coef, dtype=float) ** 2, axis=1)
+
+
+def suavizar(w, escalas):
+    # Tiempo: gaussiana de desviación igual a la escala; escala: media móvil de 3.
+    # Todas las escalas se filtran a la vez en el dominio de frecuencia.
+    n = w.shape[1]
+    tamaño = _largo_rapido(n + 4 * int(np.max(escalas)))
+    frecuencias = np.fft.rfftfreq(tamaño)
+    filtro = np.exp(-2 * (np.pi * frecuencias[None, :] * np.asarray(escalas)[:, None]) ** 2)
+    suave = np.fft.irfft(np.fft.rfft(w, tamaño, axis=1) * filtro, tamaño, axis=1)[:, :n]
+    borde = np.pad(suave, ((1, 1), (0, 0)), mode="edge")
+    return (borde[:-2] + borde[1:-1] + borde[2:]) / 3
+
+
+def coherencia(wx, wy, escalas):
+    s = np.asarray(escalas, dtype=float)[:, None]
+    sxy = suavizar(wx * wy / s, escalas)
+    sxx = suavizar(wx ** 2 / s, escalas)
+    syy = suavizar(wy ** 2 / s, escalas)
+    return np.clip(sxy ** 2 / (sxx * syy), 0, 1)
+
+
+def relacion_enso(estacion, variable, nombre_wavelet, num_escala, senal, indice, version=None):
+    # (|W_xy|, coherencia) entre la variable y el índice ENSO, cacheados
+    def calcular():
+        escalas = np.arange(1, num_escala)
+        wx = coeficientes(estacion, variable, nombre_wavelet, num_escala, senal, version)
+        wy = coeficientes(estacion, "Indice_ENSO", nombre_wavelet, num_escala, indice, version)
+        return np.abs(wx * wy).astype(np.float32), coherencia(wx, wy, escalas).astype(np.float32)
+
+    return _cacheado(("enso", estacion, variable, nombre_wavelet, num_escala, version), calcular)
+
+
+# --- Significancia frente a ruido rojo (Monte Carlo) ---
+def parametros_ar1(senal):
+    x = np.asarray(senal, dtype=float) - np.mean(senal)
+    alfa = np.corrcoef(x[:-1], x[1:])[0, 1] if x.std() > 0 else 0.0
+    return float(np.clip(np.nan_to_num(alfa), 0.0, 0.99)), float(x.std()), float(np.mean(senal))
+
+
+def _ar1_lote(rng, n_sims, n, alfa, sigma, media):
+    # Todas las simulaciones avanzan juntas en el tiempo
+    ruido = rng.normal(scale=sigma * np.sqrt(1 - alfa ** 2), size=(n_sims, n))
+    x = np.empty((n_sims, n))
+    x[:, 0] = rng.normal(scale=sigma, size=n_sims)
+    for i in range(1, n):
+        x[:, i] = alfa * x[:, i - 1] + ruido[:, i]
+    return x + media
+
+
+def _mayores(acumulados, nuevos, k):
+    # Los k valores más altos de cada fila (escala) entre lo acumulado y un bloque nuevo
+    juntos = nuevos if acumulados is None else np.concatenate([acumulados, nuevos], axis=1)
+    if juntos.shape[1] <= k:
+        return juntos
+    return np.partition(juntos, -k, axis=1)[:, -k:]
+
+
+def _cola_superior(total, nivel):
+    # Cuántos valores altos por escala bastan para el percentil `nivel` de `total`
+    return total - int(np.floor((total - 1) * nivel / 100))
+
+
+def _percentil_de_cola(cola, total, nivel):
+    # np.percentile (interpolación lineal) a partir solo de los valores más altos
+    cola = np.sort(cola, axis=1)
+    posicion = (total - 1) * nivel / 100
+    bajo = int(np.floor(posicion)) - (total - cola.shape[1])
+    alto = min(bajo + 1, cola.shape[1] - 1)
+    fraccion = posicion - np.floor(posicion)
+    return cola[:, bajo] + fraccion * (cola[:, alto] - cola[:, bajo])
+
+
+def _lote_montecarlo(semilla, n_sims, n, ar1_x, ar1_y, nombre_wavelet, num_escala, k):
+    # Devuelve, por escala, los k valores más altos de potencia (y coherencia) y
+    # el espectro global de cada simulación. Se simula por bloques y solo se
+    # conserva esa cola: la memoria no crece con el número de simulaciones.
+    rng = np.random.default_rng(semilla)
+    escalas = np.arange(1, num_escala)
+    columnas = min(n, MUESTRAS_POR_SIMULACION)
+    potencias = coherencias = None
+    globales = np.empty((n_sims, len(escalas)))
+    for inicio in range(0, n_sims, BLOQUE_SIMULACIONES):
+        bloque = min(BLOQUE_SIMULACIONES, n_sims - inicio)
+        xs = _ar1_lote(rng, bloque, n, *ar1_x)
+        ys = _ar1_lote(rng, bloque, n, *ar1_y) if ar1_y is not None else None
+        pot = np.empty((len(escalas), bloque * columnas), dtype=np.float32)
+        coh = np.empty_like(pot) if ys is not None else None
+        for b in range(bloque):
+            idx = rng.choice(n, columnas, replace=False)
+            wx = cwt_fft(xs[b], escalas, nombre_wavelet)
+            pot[:, b * columnas:(b + 1) * columnas] = wx[:, idx] ** 2
+            globales[inicio + b] = espectro_global(wx)
+            if ys is not None:
+                wy = cwt_fft(ys[b], escalas, nombre_wavelet)
+                coh[:, b * columnas:(b + 1) * columnas] = coherencia(wx, wy, escalas)[:, idx]
+        potencias = _mayores(potencias, pot, k)
+        if coh is not None:
+            coherencias = _mayores(coherencias, coh, k)
+    return potencias, globales, coherencias
+
+
+# Procesos para las simulaciones: por defecto ninguno extra (se simula en el
+# propio proceso); ENSO_PROCESOS_SIGNIFICANCIA=<n> reparte los lotes en n
+_POOL = None
+_POOL_LOCK = threading.Lock()
+
+
+def procesos_significancia():
+    return max(1, int(os.environ.get("ENSO_PROCESOS_SIGNIFICANCIA", "1")))
+
+
+def _pool():
+    global _POOL
+    with _POOL_LOCK:
+        if _POOL is None:
+            _POOL = ProcessPoolExecutor(
+                max_workers=procesos_significancia(),
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _POOL
+
+
+def simulaciones_permitidas(n_sims, num_escala):
+    # Con muchas escalas se simulan menos series para no pasar del tope
+    return max(1, min(n_sims, MAX_SIMULACIONES_ESCALAS // max(1, num_escala - 1)))
+
+
+def significancia(senal_x, nombre_wavelet, num_escala, senal_y=None, n_sims=200, nivel=95, semilla=0):
+    # Umbrales por escala al `nivel`% para la potencia, el espectro global y,
+    # si se da una segunda señal, la coherencia. Los lotes pueden ir en paralelo.
+    ar1_x = parametros_ar1(senal_x)
+    ar1_y = parametros_ar1(senal_y) if senal_y is not None else None
+    n = len(senal_x)
+    total = n_sims * min(n, MUESTRAS_POR_SIMULACION)
+    k = _cola_superior(total, nivel)
+    procesos = procesos_significancia()
+    lotes = [n_sims // procesos + (i < n_sims % procesos) for i in range(procesos)]
+    argumentos = [
+        (semilla + i, lote, n, ar1_x, ar1_y, nombre_wavelet, num_escala, k)
+        for i, lote in enumerate(lotes) if lote
+    ]
+    if procesos == 1:
+        partes = [_lote_montecarlo(*args) for args in argumentos]
+    else:
+        futuros = [_pool().submit(_lote_montecarlo, *args) for args in argumentos]
+        partes = [f.result() for f in futuros]
+    potencias = None
+    for parte in partes:
+        potencias = _mayores(potencias, parte[0], k)
+    umbrales = {
+        "potencia": _percentil_de_cola(potencias, total, nivel),
+        "global": np.percentile(np.concatenate([p[1] for p in partes]), nivel, axis=0),
+    }
+    if ar1_y is not None:
+        coherencias = None
+        for parte in partes:
+            coherencias = _mayores(coherencias, parte[2], k)
+        umbrales["coherencia"] = _percentil_de_cola(coherencias, total, nivel)
+    return umbrales
+
+
+def significancia_cacheada(clave, *args, **kwargs):
+    return _cacheado(("significancia",) + tuple(clave), lambda: significancia(*args, **kwargs))
+
+
+# --- Escalograma ---
+def reducir(mag, max_columnas=MAX_COLUMNAS):
+    # Máximo por bloques de tiempo: baja a resolución de pantalla sin perder picos
+    n = mag.shape[1]
+    if n <= max_columnas:
+        return np.asarray(mag), np.arange(n)
+    cortes = np.arange(0, n, int(np.ceil(n / max_columnas)))
+    return np.maximum.reduceat(mag, cortes, axis=1), cortes
+
+
+def figura_escalograma(mag, vmax, fechas, paleta, titulo, contorno=None, etiqueta="Magnitud", vmin=None):
+    # `contorno`: matriz del mismo tamaño; se dibuja la línea donde vale 1
+    # (p. ej. potencia / umbral de significancia)
+    import plotly.graph_objects as go
+
+    z, cortes = reducir(mag)
+    x = np.asarray(fechas)[cortes]
+    y = np.arange(1, mag.shape[0] + 1)
+    fig = go.Figure(go.Heatmap(
+        z=z,
+        x=x,
+        y=y,
+        colorscale=PALETAS.get(paleta, paleta),
+        zmin=float(z.min()) if vmin is None else vmin,
+        zmax=vmax,
+        colorbar=dict(title=etiqueta),
+        hovertemplate=f"Fecha: %{{x}}<br>Escala: %{{y}}<br>{etiqueta}: %{{z:.2f}}<extra></extra>",
+    ))
+    if contorno is not None:
+        fig.add_trace(go.Contour(
+            z=reducir(contorno)[0],
+            x=x,
+            y=y,
+            contours=dict(start=1, end=1, size=1, coloring="none"),
+            line=dict(color="black", width=1.5),
+            showscale=False,
+            hoverinfo="skip",
+            name="Significativo",
+        ))
+    fig.update_layout(title=titulo, xaxis_title="Fecha", yaxis_title="Escala", height=500, template="plotly_white")
+    return fig
+
+
+def png_escalograma(mag, vmax, paleta, titulo, dpi=300):
+    # Rasterización en alta resolución, solo para la descarga
+    import matplotlib
+
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    fig, ax = plt.subplots(figsize=(10, 5))
+    im = ax.imshow(
+        mag,
+        extent=[0, mag.shape[1] - 1, mag.shape[0], 1],
+        cmap=paleta,
+        aspect="auto",
+        vmax=vmax,
+    )
+    ax.set_title(titulo)
+    ax.set_ylabel("Escala")
+    ax.set_xlabel("Índice de Tiempo")
+    ax.invert_yaxis()
+    fig.colorbar(im, ax=ax, label="Magnitud")
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format="png", dpi=dpi, bbox_inches="tight")
+    plt.close(fig)
+    return buffer.getvalue()
+
+
+# --- Precálculo offline ---
+def precalcular(almacen=None):
+    almacen = datos.leer_almacen() if almacen is None else almacen
+    generados = []
+    for estacion in datos.estaciones(almacen):
+        df = datos.consultar(almacen, [estacion]).dropna(subset=["Fecha"])
+        for variable in variables(df):
+            senal = preparar_senal(df[variable])
+            for nombre_wavelet in WAVELETS:
+                ruta = ruta_precalculo(estacion, variable, nombre_wavelet)
+                os.makedirs(os.path.dirname(ruta), exist_ok=True)
+                np.save(ruta, transformar(senal, nombre_wavelet, ESCALA_MAX))
+                generados.append(ruta)
+    return generados
+
+
+if __name__ == "__main__":
+    for ruta in precalcular():
+        print(f"✔ {ruta}")